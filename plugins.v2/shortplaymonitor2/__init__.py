@@ -1,18 +1,29 @@
 import datetime
+import io
+import json
+import math
 import os
+import queue
+import random
 import re
+import subprocess
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 from pathlib import Path
 from threading import Lock
-from typing import Any, List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional, Union
+from urllib.parse import urlparse
 from xml.dom import minidom
 
 import chardet
 import pytz
+import requests
 from PIL import Image
 from apscheduler.schedulers.background import BackgroundScheduler
 from lxml import etree
 from requests import RequestException
+from requests.adapters import HTTPAdapter
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 from watchdog.observers.polling import PollingObserver
@@ -33,8 +44,125 @@ from app.utils.dom import DomUtils
 from app.utils.http import RequestUtils
 from app.utils.system import SystemUtils
 
-ffmpeg_lock = threading.Lock()
-lock = Lock()
+
+class FfmpegExecutor:
+    """
+    ffmpeg 进程执行器：限制同时运行的进程数，按参数列表调用（不经过 shell），超时后结束进程
+    """
+
+    def __init__(self, concurrency: int = 2, timeout: int = 60):
+        self._semaphore = threading.BoundedSemaphore(concurrency)
+        self._stats_lock = threading.Lock()
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # 队列指标
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.run_time = 0.0
+
+    def configure(self, concurrency: int, timeout: int):
+        """
+        调整并发数与超时，已在运行的进程不受影响
+        """
+        concurrency = max(1, concurrency)
+        if concurrency != self.concurrency:
+            self._semaphore = threading.BoundedSemaphore(concurrency)
+            self.concurrency = concurrency
+        self.timeout = max(1, timeout)
+
+    def run(self, args: List[str], timeout: Optional[int] = None) -> Tuple[int, bytes, bytes]:
+        """
+        执行 ffmpeg，返回 (返回码, stdout, stderr)；超时或无法启动时返回码为 -1
+        """
+        timeout = timeout or self.timeout
+        semaphore = self._semaphore
+        queued = time.perf_counter()
+        with self._stats_lock:
+            self.waiting += 1
+        with semaphore:
+            started = time.perf_counter()
+            with self._stats_lock:
+                self.waiting -= 1
+                self.running += 1
+                self.wait_time += started - queued
+            returncode, stdout, stderr = -1, b"", b""
+            try:
+                process = subprocess.Popen(args, stdin=subprocess.DEVNULL,
+                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                try:
+                    stdout, stderr = process.communicate(timeout=timeout)
+                    returncode = process.returncode
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.communicate()
+                    stderr = f"ffmpeg 执行超时（{timeout}秒）".encode()
+                    with self._stats_lock:
+                        self.timeouts += 1
+            except OSError as e:
+                stderr = str(e).encode()
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._stats_lock:
+                    self.running -= 1
+                    self.run_time += elapsed
+                    if returncode == 0:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+        logger.debug(f"ffmpeg 执行完成：返回码 {returncode}，排队 {started - queued:.2f} 秒，"
+                     f"耗时 {elapsed:.2f} 秒；{self.stats()}")
+        return returncode, stdout, stderr
+
+    def stats(self) -> dict:
+        """
+        队列指标
+        """
+        with self._stats_lock:
+            finished = self.completed + self.failed
+            return {
+                "concurrency": self.concurrency,
+                "waiting": self.waiting,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timeouts": self.timeouts,
+                "avg_wait": round(self.wait_time / finished, 2) if finished else 0,
+                "avg_run": round(self.run_time / finished, 2) if finished else 0
+            }
+
+
+ffmpeg_executor = FfmpegExecutor()
+
+# 默认封面来源：priority 越小优先级越高；url 中 {cat} 与 {title} 会被替换
+DEFAULT_COVER_SOURCES = [
+    {
+        "domain": "agsvpt.com",
+        "url": "https://www.agsvpt.com/torrents.php?search_mode=0&search_area=0&page=0&notnewword=1&cat={cat}&search={title}",
+        "cat": "419",
+        "xpath": "//*[@id='kdescr']/img[1]/@src",
+        "priority": 1
+    },
+    {
+        "domain": "ilolicon.com",
+        "url": "https://share.ilolicon.com/torrents.php?search_mode=0&search_area=0&page=0&notnewword=1&cat={cat}&search={title}",
+        "cat": "402",
+        "xpath": "//*[@id='kdescr']/img[1]/@src",
+        "priority": 2
+    }
+]
+# 转移锁按目标目录分段：同一目标目录的操作串行，不同目录（或不同磁盘）的转移互不阻塞
+transfer_locks = [Lock() for _ in range(32)]
+
+
+def get_transfer_lock(target_file: Path) -> Lock:
+    """
+    按目标文件所在目录取分段锁
+    """
+    return transfer_locks[hash(str(Path(target_file).parent)) % len(transfer_locks)]
 
 
 class FileMonitorHandler(FileSystemEventHandler):
@@ -62,7 +190,7 @@ class ShortPlayMonitor2(_PluginBase):
     # 插件图标
     plugin_icon = "Amule_B.png"
     # 插件版本
-    plugin_version = "1.0"
+    plugin_version = "1.1"
     # 插件作者
     plugin_author = "dadinet"
     # 作者主页
@@ -89,6 +217,43 @@ class ShortPlayMonitor2(_PluginBase):
     _interval = 10
     _notify = False
     _medias = {}
+    # 文件稳定等待（秒）：大小与修改时间在该时间内不变才处理，0 为收到事件立即处理
+    _debounce = 5
+    # 等待稳定的文件：路径 -> {source_dir, sig, since}
+    _pending_files: Dict[str, dict] = {}
+    _pending_lock = threading.Lock()
+    _debounce_stop: Optional[threading.Event] = None
+    # 处理线程数：监控线程只负责投递，文件处理（转移、刮削、封面）在有界队列的工作线程中执行
+    _workers = 2
+    _queue_size = 1000
+    _task_queue: Optional[queue.Queue] = None
+    _worker_stop: Optional[threading.Event] = None
+    # 同一剧集目录的任务串行执行：正在处理的剧集目录与其后续排队的任务
+    _active_shows: Dict[str, List[tuple]] = {}
+    _show_lock = threading.Lock()
+    # 停止处理线程时尚未处理的任务（修改配置时），重新启动处理线程后继续投递
+    _carryover_tasks: List[tuple] = []
+    # ffmpeg 同时运行的进程数与单次超时（秒）
+    _ffmpeg_workers = 2
+    _ffmpeg_timeout = 60
+    # 截图模式：fast 关键帧快速定位并从多帧候选中挑选最佳帧；accurate 为原先的逐帧解码到指定时间
+    _thumb_mode = "fast"
+    # 站点封面检索缓存：标题 -> {url, time, fails, retry_at}，持久化到插件数据
+    _cover_cache: Optional[Dict[str, dict]] = None
+    _cover_cache_lock = threading.Lock()
+    _cover_cache_ttl = 30
+    _cover_cache_limit = 2000
+    # 封面来源（JSON 数组）：各来源并发检索，取优先级最高的成功结果；整体等待上限（秒）
+    _cover_sources = ""
+    _cover_timeout = 90
+    # 站点请求：按域名复用连接池会话；同一域名两次请求的最小间隔（秒）；重试退避基数（秒）
+    _sessions: Dict[str, requests.Session] = {}
+    _session_lock = threading.Lock()
+    _rate_interval = 1.0
+    _rate_next: Dict[str, float] = {}
+    _retry_backoff = 2.0
+    # 进行中的封面检索取消标记，停止插件时一并取消，中断退避与限速等待
+    _cover_cancels: set = set()
 
     # 定时器
     _scheduler: Optional[BackgroundScheduler] = None
@@ -98,6 +263,7 @@ class ShortPlayMonitor2(_PluginBase):
         self._dirconf = {}
         self._renameconf = {}
         self._coverconf = {}
+        self._cover_cache = None
 
         if config:
             self._enabled = config.get("enabled")
@@ -109,6 +275,22 @@ class ShortPlayMonitor2(_PluginBase):
             self._exclude_keywords = config.get("exclude_keywords") or ""
             self._transfer_type = config.get("transfer_type") or "link"
             self.proxy = config.get("proxy", "")
+            try:
+                self._debounce = max(0, int(config.get("debounce") if config.get("debounce") not in (None, "") else 5))
+            except (TypeError, ValueError):
+                self._debounce = 5
+            try:
+                self._workers = max(1, int(config.get("workers") or 2))
+            except (TypeError, ValueError):
+                self._workers = 2
+            try:
+                self._ffmpeg_workers = max(1, int(config.get("ffmpeg_workers") or 2))
+                self._ffmpeg_timeout = max(1, int(config.get("ffmpeg_timeout") or 60))
+            except (TypeError, ValueError):
+                self._ffmpeg_workers, self._ffmpeg_timeout = 2, 60
+            self._thumb_mode = config.get("thumb_mode") or "fast"
+            self._cover_sources = config.get("cover_sources") or ""
+            ffmpeg_executor.configure(concurrency=self._ffmpeg_workers, timeout=self._ffmpeg_timeout)
 
         # 停止现有任务
         self.stop_service()
@@ -180,6 +362,18 @@ class ShortPlayMonitor2(_PluginBase):
                             logger.error(f"{source_dir} 启动目录监控失败：{err_msg}")
                         self.systemmessage.put(f"{source_dir} 启动目录监控失败：{err_msg}")
 
+            # 启动处理线程
+            self.__start_workers()
+
+            # 启动文件稳定检查线程
+            if self._enabled and self._observer and self._debounce:
+                self._debounce_stop = threading.Event()
+                threading.Thread(target=self.__debounce_loop, args=(self._debounce_stop,),
+                                 name="ShortPlayMonitor2-debounce", daemon=True).start()
+
+            # 继续处理上次停止时未完成的任务
+            self.__resume_pending()
+
             # 运行一次定时服务
             if self._onlyonce:
                 logger.info("短剧监控服务启动，立即运行一次")
@@ -209,12 +403,13 @@ class ShortPlayMonitor2(_PluginBase):
         logger.info("开始全量同步短剧监控目录 ...")
         # 遍历所有监控目录
         for mon_path in self._dirconf.keys():
-            # 遍历目录下所有文件
+            # 遍历目录下所有文件，按剧集目录分组投递
+            show_files: Dict[str, List[str]] = {}
             for file_path in SystemUtils.list_files(Path(mon_path), settings.RMT_MEDIAEXT):
-                self.__handle_file(is_directory=Path(file_path).is_dir(),
-                                   event_path=str(file_path),
-                                   source_dir=mon_path)
-        logger.info("全量同步短剧监控目录完成！")
+                show_files.setdefault(str(Path(file_path).parent), []).append(str(file_path))
+            for file_paths in show_files.values():
+                self.__submit_files(source_dir=mon_path, file_paths=sorted(file_paths))
+        logger.info("全量同步短剧监控目录完成，文件已全部投递处理队列！")
 
     def __handle_image(self):
         """
@@ -274,9 +469,244 @@ class ShortPlayMonitor2(_PluginBase):
 
         # 文件发生变化
         logger.debug(f"变动类型 {event.event_type} 变动路径 {event_path}")
-        self.__handle_file(is_directory=event.is_directory,
-                           event_path=event_path,
-                           source_dir=source_dir)
+        if self._debounce and self._debounce_stop and not event.is_directory:
+            # 等待文件写入完成后再处理，重命名事件同时移除原路径
+            self.__queue_file(event_path=event_path, source_dir=source_dir,
+                              src_path=event.src_path if event.event_type == "moved" else None)
+            return
+        if event.is_directory:
+            self.__handle_file(is_directory=True,
+                               event_path=event_path,
+                               source_dir=source_dir)
+            return
+        self.__submit_files(source_dir=source_dir, file_paths=[event_path])
+
+    def __queue_file(self, event_path: str, source_dir: str, src_path: Optional[str] = None):
+        """
+        加入稳定等待队列，同一路径的重复事件（创建+移动）合并为一条
+        """
+        with self._pending_lock:
+            if src_path and src_path != event_path:
+                self._pending_files.pop(src_path, None)
+            item = self._pending_files.get(event_path)
+            if item:
+                item["source_dir"] = source_dir
+                return
+            self._pending_files[event_path] = {
+                "source_dir": source_dir,
+                "sig": self.__get_file_sig(event_path),
+                "since": time.time()
+            }
+
+    @staticmethod
+    def __get_file_sig(file_path: str) -> Optional[Tuple[int, float]]:
+        """
+        文件大小与修改时间，文件不存在时返回 None
+        """
+        try:
+            stat = os.stat(file_path)
+            return stat.st_size, stat.st_mtime
+        except OSError:
+            return None
+
+    def __debounce_loop(self, stop_event: threading.Event):
+        """
+        每秒检查一次等待队列，释放已稳定的文件
+        """
+        while not stop_event.wait(1):
+            try:
+                self.__release_stable_files()
+            except Exception as e:
+                logger.error(f"文件稳定检查出错：{str(e)}")
+
+    def __release_stable_files(self):
+        """
+        大小与修改时间持续不变超过等待时间的文件按剧集目录分组，整组处理
+        """
+        now = time.time()
+        ready: Dict[Tuple[str, str], List[str]] = {}
+        with self._pending_lock:
+            for file_path, item in list(self._pending_files.items()):
+                sig = self.__get_file_sig(file_path)
+                if sig is None:
+                    # 文件已被删除或移走
+                    del self._pending_files[file_path]
+                    continue
+                if sig != item.get("sig"):
+                    item["sig"] = sig
+                    item["since"] = now
+                    continue
+                if now - item.get("since") >= self._debounce:
+                    del self._pending_files[file_path]
+                    ready.setdefault((item.get("source_dir"), str(Path(file_path).parent)), []).append(file_path)
+        for (source_dir, show_dir), file_paths in ready.items():
+            logger.info(f"{show_dir} 共 {len(file_paths)} 个文件已稳定，开始处理")
+            self.__submit_files(source_dir=source_dir, file_paths=sorted(file_paths))
+
+    def __start_workers(self):
+        """
+        启动处理线程，每次启动使用新的队列与停止标记，旧线程随旧队列退出
+        """
+        self._worker_stop = threading.Event()
+        with self._show_lock:
+            self._task_queue = queue.Queue(maxsize=self._queue_size)
+            self._active_shows = {}
+        for i in range(self._workers):
+            threading.Thread(target=self.__worker_loop, args=(self._task_queue, self._worker_stop),
+                             name=f"ShortPlayMonitor2-worker-{i}", daemon=True).start()
+
+    def __submit_files(self, source_dir: str, file_paths: List[str]):
+        """
+        投递同一剧集目录下的一组文件，未启动处理线程时直接处理；
+        按重命名后的目标剧集目录串行，不同源目录整理到同一剧集时不会并发写入
+        """
+        try:
+            target = self.__get_target_path(event_path=file_paths[0], source_dir=source_dir)
+        except Exception as e:
+            logger.debug(f"计算 {file_paths[0]} 目标路径出错：{str(e)}")
+            target = None
+        # 无法计算目标路径时按源目录串行，具体错误在处理文件时输出
+        show_key = str(Path(target[0]).parent) if target else str(Path(file_paths[0]).parent)
+        task = (show_key, source_dir, file_paths)
+        task_queue = self._task_queue
+        if not task_queue:
+            self.__handle_batch(task)
+            return
+        if task_queue.full():
+            logger.warning(f"处理队列已满（{self._queue_size}），等待空闲后投递 {task[0]}")
+        task_queue.put(task)
+
+    def __worker_loop(self, task_queue: queue.Queue, stop_event: threading.Event):
+        """
+        处理线程：同一目标剧集目录正在处理时，新任务挂到该目录后面由当前线程接着处理
+        """
+        while not stop_event.is_set():
+            try:
+                task = task_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                show_key = task[0]
+                with self._show_lock:
+                    if show_key in self._active_shows:
+                        self._active_shows[show_key].append(task)
+                        continue
+                    self._active_shows[show_key] = []
+                while task and not stop_event.is_set():
+                    self.__handle_batch(task)
+                    with self._show_lock:
+                        backlog = self._active_shows.get(show_key)
+                        if backlog:
+                            task = backlog.pop(0)
+                        else:
+                            self._active_shows.pop(show_key, None)
+                            task = None
+                if task:
+                    # 停止后取到的任务未处理，交给重新启动的处理线程
+                    self.__carry_over(tasks=[task], task_queue=task_queue)
+            finally:
+                task_queue.task_done()
+
+    def __carry_over(self, tasks: List[tuple], task_queue: Optional[queue.Queue]):
+        """
+        暂存停止时未处理的任务，重新启动处理线程后投递；已重新启动时直接投递到新队列
+        """
+        with self._show_lock:
+            new_queue = self._task_queue
+            if not new_queue or new_queue is task_queue:
+                self._carryover_tasks = self._carryover_tasks + list(tasks)
+                return
+        for task in tasks:
+            new_queue.put(task)
+
+    def __drain_workers(self) -> int:
+        """
+        停止处理线程，取出队列中与各剧集后续排队的任务暂存，返回暂存的任务数
+        """
+        self._worker_stop.set()
+        self._worker_stop = None
+        with self._show_lock:
+            task_queue, self._task_queue = self._task_queue, None
+            # 先取各剧集排在正在处理任务之后的任务，保持同一剧集的先后顺序
+            tasks = []
+            for backlog in self._active_shows.values():
+                tasks.extend(backlog)
+                backlog.clear()
+        while task_queue:
+            try:
+                tasks.append(task_queue.get_nowait())
+            except queue.Empty:
+                break
+            task_queue.task_done()
+        self.__carry_over(tasks=tasks, task_queue=None)
+        return len(tasks)
+
+    def __resume_pending(self):
+        """
+        重新投递上次停止时未处理的任务，按当前配置重新计算目标剧集目录；
+        等待稳定的文件由检查线程继续等待，未开启稳定等待时直接投递
+        """
+        with self._show_lock:
+            tasks, self._carryover_tasks = self._carryover_tasks, []
+        files: Dict[Tuple[str, str], List[str]] = {}
+        if not self._debounce_stop:
+            with self._pending_lock:
+                for file_path, item in self._pending_files.items():
+                    files.setdefault((item.get("source_dir"), str(Path(file_path).parent)), []).append(file_path)
+                self._pending_files = {}
+        if not tasks and not files:
+            return
+        logger.info(f"继续处理上次停止时未完成的 {len(tasks)} 个任务、{sum(len(v) for v in files.values())} 个文件")
+        for _, source_dir, file_paths in tasks:
+            self.__submit_files(source_dir=source_dir, file_paths=file_paths)
+        for (source_dir, _), file_paths in files.items():
+            self.__submit_files(source_dir=source_dir, file_paths=sorted(file_paths))
+
+    def __handle_batch(self, task: tuple):
+        """
+        处理同一剧集目录下的一组文件
+        """
+        _, source_dir, file_paths = task
+        for file_path in file_paths:
+            try:
+                self.__handle_file(is_directory=False, event_path=file_path, source_dir=source_dir)
+            except Exception as e:
+                logger.error(f"处理文件 {file_path} 出错：{str(e)}")
+
+    def __get_target_path(self, event_path: str, source_dir: str) -> Optional[Tuple[Union[str, Path], Any, Any]]:
+        """
+        按目录重命名配置计算目标路径
+        :param event_path: 事件文件路径
+        :param source_dir: 监控目录
+        :return: (目标路径, 剧集标题, 重命名配置)，重命名配置无效时返回 None
+        """
+        # 转移路径
+        dest_dir = self._dirconf.get(source_dir)
+        # 是否重命名
+        rename_conf = self._renameconf.get(source_dir)
+        target_path = event_path.replace(source_dir, dest_dir)
+        # 目录重命名
+        if str(rename_conf) == "true" or str(rename_conf) == "false":
+            rename_conf = bool(rename_conf)
+            target = target_path.replace(dest_dir, "")
+            parent = Path(Path(target).parents[0])
+            last = target.replace(str(parent), "")
+            if rename_conf:
+                # 自定义识别次
+                title, _ = WordsMatcher().prepare(str(parent))
+                target_path = Path(dest_dir).joinpath(title + last)
+            else:
+                title = parent
+        elif str(rename_conf) == "smart":
+            target = target_path.replace(dest_dir, "")
+            parent = Path(Path(target).parents[0])
+            last = target.replace(str(parent), "")
+            # 取.第一个
+            title = Path(parent).name.split(".")[0]
+            target_path = Path(dest_dir).joinpath(title + last)
+        else:
+            return None
+        return target_path, title, rename_conf
 
     def __handle_file(self, is_directory: bool, event_path: str, source_dir: str):
         """
@@ -286,10 +716,6 @@ class ShortPlayMonitor2(_PluginBase):
         :param source_dir: 监控目录
         """
         try:
-            # 转移路径
-            dest_dir = self._dirconf.get(source_dir)
-            # 是否重命名
-            rename_conf = self._renameconf.get(source_dir)
             # 封面比例
             cover_conf = self._coverconf.get(source_dir)
             # 元数据
@@ -297,31 +723,11 @@ class ShortPlayMonitor2(_PluginBase):
             if not file_meta.name:
                 logger.error(f"{Path(event_path).name} 无法识别有效信息")
                 return
-            title = None
-            target_path = event_path.replace(source_dir, dest_dir)
-            # 目录重命名
-            if str(rename_conf) == "true" or str(rename_conf) == "false":
-                rename_conf = bool(rename_conf)
-                target = target_path.replace(dest_dir, "")
-                parent = Path(Path(target).parents[0])
-                last = target.replace(str(parent), "")
-                if rename_conf:
-                    # 自定义识别次
-                    title, _ = WordsMatcher().prepare(str(parent))
-                    target_path = Path(dest_dir).joinpath(title + last)
-                else:
-                    title = parent
-            else:
-                if str(rename_conf) == "smart":
-                    target = target_path.replace(dest_dir, "")
-                    parent = Path(Path(target).parents[0])
-                    last = target.replace(str(parent), "")
-                    # 取.第一个
-                    title = Path(parent).name.split(".")[0]
-                    target_path = Path(dest_dir).joinpath(title + last)
-                else:
-                    logger.error(f"{target_path} 智能重命名失败")
-                    return
+            target = self.__get_target_path(event_path=event_path, source_dir=source_dir)
+            if not target:
+                logger.error(f"{event_path.replace(source_dir, self._dirconf.get(source_dir))} 智能重命名失败")
+                return
+            target_path, title, rename_conf = target
             # 文件夹同步创建
             if is_directory:
                 # 目标文件夹不存在则创建
@@ -360,16 +766,15 @@ class ShortPlayMonitor2(_PluginBase):
                                                title=title)
                     # 生成缩略图
                     if not (target_path.parent / "poster.jpg").exists():
-                        thumb_path = self.gen_file_thumb(title=title,
+                        thumb_data = self.gen_file_thumb(title=title,
                                                          rename_conf=rename_conf,
                                                          file_path=target_path)
-                        if thumb_path and Path(thumb_path).exists():
-                            self.__save_poster(input_path=thumb_path,
+                        if thumb_data:
+                            self.__save_poster(input_path=thumb_data,
                                                poster_path=target_path.parent / "poster.jpg",
                                                cover_conf=cover_conf)
                             if (target_path.parent / "poster.jpg").exists():
                                 logger.info(f"{target_path.parent / 'poster.jpg'} 缩略图已生成")
-                            thumb_path.unlink()
                         else:
                             # 检查是否有缩略图
                             thumb_files = SystemUtils.list_files(directory=target_path.parent,
@@ -450,7 +855,7 @@ class ShortPlayMonitor2(_PluginBase):
         :param target_file: 目标文件路径
         :param transfer_type: RmtMode转移方式
         """
-        with lock:
+        with get_transfer_lock(target_file):
 
             # 转移
             if transfer_type == 'link':
@@ -471,12 +876,16 @@ class ShortPlayMonitor2(_PluginBase):
 
         return retcode
 
-    def __save_poster(self, input_path, poster_path, cover_conf):
+    def __save_poster(self, input_path: Union[str, Path, bytes], poster_path, cover_conf):
         """
-        截取图片做封面
+        截取图片做封面，输入可以是图片文件或内存中的图片数据；先写临时文件再替换，避免读到半张图
         """
         try:
-            image = Image.open(input_path)
+            if isinstance(input_path, bytes):
+                image = Image.open(io.BytesIO(input_path))
+            else:
+                image = Image.open(input_path)
+            image.load()
 
             # 需要截取的长宽比（比如 16:9）
             if not cover_conf:
@@ -504,9 +913,18 @@ class ShortPlayMonitor2(_PluginBase):
 
             # 截取图片
             cropped_image = image.crop((left, top, right, bottom))
+            if cropped_image.mode not in ("RGB", "L"):
+                cropped_image = cropped_image.convert("RGB")
 
             # 保存截取后的图片
-            cropped_image.save(poster_path)
+            poster_path = Path(poster_path)
+            tmp_path = poster_path.with_name(f".{poster_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                cropped_image.save(tmp_path, format="JPEG", quality=95)
+                os.replace(tmp_path, poster_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
         except Exception as e:
             print(str(e))
 
@@ -536,59 +954,198 @@ class ShortPlayMonitor2(_PluginBase):
         file_path.write_bytes(xml_str)
         logger.info(f"NFO文件已保存：{file_path}")
 
-    def gen_file_thumb_from_site(self, title: str, file_path: Path):
+    def gen_file_thumb_from_site(self, title: str) -> Optional[bytes]:
         """
-        从agsv或者萝莉站查询封面
+        从agsv或者萝莉站查询封面，返回图片数据；先查询封面缓存，命中则跳过站点检索
         """
         try:
-            image = None
-            # 查询索引
-            domain = "agsvpt.com"
-            site = SiteOper().get_by_domain(domain)
-            index = SitesHelper().get_indexer(domain)
-            if site:
-                req_url = f"https://www.agsvpt.com/torrents.php?search_mode=0&search_area=0&page=0&notnewword=1&cat=419&search={title}"
-                image_xpath = "//*[@id='kdescr']/img[1]/@src"
-                # 查询站点资源
-                logger.info(f"开始检索 {site.name} {title}")
-                image = self.__get_site_torrents(url=req_url, site=site, image_xpath=image_xpath, index=index)
-            if not image:
-                domain = "ilolicon.com"
-                site = SiteOper().get_by_domain(domain)
-                index = SitesHelper().get_indexer(domain)
-                if site:
-                    req_url = f"https://share.ilolicon.com/torrents.php?search_mode=0&search_area=0&page=0&notnewword=1&cat=402&search={title}"
-
-                    image_xpath = "//*[@id='kdescr']/img[1]/@src"
-                    # 查询站点资源
-                    logger.info(f"开始检索 {site.name} {title}")
-                    image = self.__get_site_torrents(url=req_url, site=site, image_xpath=image_xpath, index=index)
+            cache_key = self.__get_cover_cache_key(title)
+            cached = self.__get_cover_cache(cache_key)
+            if cached:
+                if cached.get("url"):
+                    logger.info(f"{title} 命中封面缓存：{cached.get('url')}")
+                    data = self.__download_image(url=cached.get("url"), title=title)
+                    if data:
+                        return data
+                    # 缓存的地址已失效，重新检索
+                    self.__set_cover_cache(cache_key, None)
+                else:
+                    logger.info(f"{title} 近期检索站点封面失败，"
+                                f"{datetime.datetime.fromtimestamp(cached.get('retry_at')).strftime('%Y-%m-%d %H:%M')} 后再重试")
+                    return None
 
+            image = self.__search_site_cover(title=title)
             if not image:
                 logger.error(f"检索站点 {title} 封面失败")
+                self.__set_cover_cache(cache_key, None)
                 return None
 
-            # 下载图片保存
-            if self.__save_image(url=image, file_path=file_path):
-                return file_path
-            return None
+            # 下载图片
+            data = self.__download_image(url=image, title=title)
+            self.__set_cover_cache(cache_key, image if data else None)
+            return data
         except Exception as e:
             logger.error(f"检索站点 {title} 封面失败 {str(e)}")
             return None
 
+    def __search_site_cover(self, title: str) -> Optional[str]:
+        """
+        并发检索所有封面来源，返回优先级最高的成功结果；更高优先级的来源都失败后才采用低优先级结果，
+        确定结果后取消其余检索
+        """
+        sources = self.__get_cover_sources()
+        if not sources:
+            return None
+        cancel_event = threading.Event()
+        with self._session_lock:
+            self._cover_cancels.add(cancel_event)
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="ShortPlayMonitor2-cover")
+        futures = {executor.submit(self.__search_cover_source, source, title, cancel_event): i
+                   for i, source in enumerate(sources)}
+        results: Dict[int, Optional[str]] = {}
+        try:
+            for future in as_completed(futures, timeout=self._cover_timeout):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    logger.error(f"检索站点 {sources[futures[future]].get('domain')} 封面出错：{str(e)}")
+                    results[futures[future]] = None
+                for i in range(len(sources)):
+                    if i not in results:
+                        # 更高优先级的来源还在检索中
+                        break
+                    if results[i]:
+                        logger.info(f"{title} 采用 {sources[i].get('domain')} 的封面")
+                        return results[i]
+        except FutureTimeoutError:
+            logger.warning(f"检索站点 {title} 封面超时（{self._cover_timeout}秒），使用已返回的结果")
+            for i in sorted(results):
+                if results[i]:
+                    return results[i]
+        finally:
+            cancel_event.set()
+            with self._session_lock:
+                self._cover_cancels.discard(cancel_event)
+            executor.shutdown(wait=False, cancel_futures=True)
+        return None
+
+    def __get_cover_sources(self) -> List[dict]:
+        """
+        读取封面来源配置，只保留格式正确且已添加的站点，按优先级排序
+        """
+        sources = DEFAULT_COVER_SOURCES
+        if self._cover_sources:
+            try:
+                sources = json.loads(self._cover_sources)
+            except Exception as e:
+                logger.error(f"封面来源配置解析失败，使用默认来源：{str(e)}")
+        if not isinstance(sources, list):
+            logger.error("封面来源配置应为数组，已忽略")
+            return []
+        result = []
+        for source in sources:
+            if not isinstance(source, dict):
+                logger.warning(f"封面来源配置项应为对象，已跳过：{source}")
+                continue
+            domain = source.get("domain")
+            if not domain or not source.get("url"):
+                logger.warning(f"封面来源配置项缺少 domain 或 url，已跳过：{source}")
+                continue
+            try:
+                priority = int(source.get("priority")) if source.get("priority") is not None else 99
+            except (TypeError, ValueError):
+                logger.warning(f"封面来源 {domain} 的优先级 {source.get('priority')} 不是整数，已跳过")
+                continue
+            site = SiteOper().get_by_domain(domain)
+            if not site:
+                continue
+            result.append({
+                **source,
+                "priority": priority,
+                "site": site,
+                "index": SitesHelper().get_indexer(domain),
+                "xpath": source.get("xpath") or "//*[@id='kdescr']/img[1]/@src"
+            })
+        return sorted(result, key=lambda x: x.get("priority"))
+
+    def __search_cover_source(self, source: dict, title: str, cancel_event: threading.Event) -> Optional[str]:
+        """
+        检索单个封面来源
+        """
+        site = source.get("site")
+        req_url = str(source.get("url")).replace("{cat}", str(source.get("cat") or "")).replace("{title}", title)
+        # 查询站点资源
+        logger.info(f"开始检索 {site.name} {title}")
+        return self.__get_site_torrents(url=req_url, site=site, image_xpath=source.get("xpath"),
+                                        index=source.get("index"), cancel_event=cancel_event)
+
+    @staticmethod
+    def __get_cover_cache_key(title: str) -> str:
+        """
+        封面缓存键：标题转小写并去掉空白与标点
+        """
+        return re.sub(r"[\W_]+", "", str(title).lower())
+
+    def __load_cover_cache(self) -> Dict[str, dict]:
+        """
+        首次使用时从插件数据中读取封面缓存
+        """
+        if self._cover_cache is None:
+            self._cover_cache = self.get_data("cover_cache") or {}
+        return self._cover_cache
+
+    def __get_cover_cache(self, key: str) -> Optional[dict]:
+        """
+        读取未过期的缓存：找到的地址保留 _cover_cache_ttl 天，未找到的在重试时间之前有效
+        """
+        if not key:
+            return None
+        with self._cover_cache_lock:
+            entry = self.__load_cover_cache().get(key)
+        if not entry:
+            return None
+        now = time.time()
+        if entry.get("url"):
+            if now - entry.get("time", 0) < self._cover_cache_ttl * 86400:
+                return entry
+        elif now < entry.get("retry_at", 0):
+            return entry
+        return None
+
+    def __set_cover_cache(self, key: str, url: Optional[str]):
+        """
+        写入缓存：未找到时按连续失败次数指数退避（1小时起，最长7天）；超过上限时淘汰最旧的记录
+        """
+        if not key:
+            return
+        now = time.time()
+        with self._cover_cache_lock:
+            cache = self.__load_cover_cache()
+            if url:
+                cache[key] = {"url": url, "time": now}
+            else:
+                fails = (cache.get(key) or {}).get("fails", 0) + 1
+                cache[key] = {"url": None, "time": now, "fails": fails,
+                              "retry_at": now + min(3600 * 2 ** (fails - 1), 7 * 86400)}
+            if len(cache) > self._cover_cache_limit:
+                for old_key in sorted(cache, key=lambda k: cache[k].get("time", 0))[:len(cache) - self._cover_cache_limit]:
+                    del cache[old_key]
+            self.save_data("cover_cache", cache)
+
     @retry(RequestException, logger=logger)
-    def __save_image(self, url: str, file_path: Path):
+    def __download_image(self, url: str, title: str) -> Optional[bytes]:
         """
-        下载图片并保存, 失败则使用代理重试
+        下载图片并返回图片数据, 失败则使用代理重试
         """
-        logger.info(f"正在下载 {file_path.stem} 图片: {url} ...")
+        logger.info(f"正在下载 {title} 图片: {url} ...")
         # 1. 尝试直接下载
         try:
-            r = RequestUtils().get_res(url=url, raise_exception=True)
+            if not self.__wait_rate_limit(url):
+                return None
+            r = RequestUtils(session=self.__get_session(url)).get_res(url=url, raise_exception=True)
             if r and r.content:
-                file_path.write_bytes(r.content)
-                logger.info(f"图片已直接保存: {file_path}")
-                return True
+                logger.info(f"图片已直接下载: {url}")
+                return r.content
         except Exception as e:
             logger.warning(f"直接下载图片失败: {e}")
 
@@ -597,24 +1154,68 @@ class ShortPlayMonitor2(_PluginBase):
             logger.info("直接下载失败，尝试使用代理...")
             try:
                 proxies = {"http": self.proxy, "https": self.proxy}
-                r = RequestUtils(proxies=proxies).get_res(url=url, raise_exception=True)
+                if not self.__wait_rate_limit(url):
+                    return None
+                r = RequestUtils(proxies=proxies, session=self.__get_session(url)).get_res(url=url,
+                                                                                          raise_exception=True)
                 if r and r.content:
-                    file_path.write_bytes(r.content)
-                    logger.info(f"使用代理成功保存图片: {file_path}")
-                    return True
+                    logger.info(f"使用代理成功下载图片: {url}")
+                    return r.content
             except Exception as e:
                 logger.error(f"使用代理下载图片失败: {e}")
         else:
             logger.warning("未设置代理，跳过代理重试。")
 
-        logger.error(f"{file_path.stem} 图片最终下载失败")
-        return False
+        logger.error(f"{title} 图片最终下载失败")
+        return None
 
-    def __get_site_torrents(self, url: str, site, image_xpath, index):
+    def __get_session(self, url: str) -> requests.Session:
         """
-        查询站点资源
+        按域名取连接池会话，同一站点的检索、详情页与图片下载复用连接
         """
-        page_source = self.__get_page_source(url=url, site=site)
+        domain = urlparse(url).netloc
+        with self._session_lock:
+            session = self._sessions.get(domain)
+            if not session:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[domain] = session
+            return session
+
+    def __wait_rate_limit(self, url: str, cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        同一域名的请求至少间隔 _rate_interval 秒，多个线程按顺序排队
+        :return: 等待期间被取消或插件停止时返回 False
+        """
+        domain = urlparse(url).netloc
+        with self._session_lock:
+            now = time.monotonic()
+            start_at = max(now, self._rate_next.get(domain, 0))
+            self._rate_next[domain] = start_at + self._rate_interval
+        return self.__wait(start_at - now, cancel_event=cancel_event)
+
+    def __wait(self, seconds: float, cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        可中断的等待：封面检索等待取消标记，其余等待处理线程的停止标记
+        :return: 等待期间被取消或插件停止时返回 False
+        """
+        event = cancel_event or self._worker_stop
+        if event is None:
+            if seconds > 0:
+                time.sleep(seconds)
+            return True
+        if seconds <= 0:
+            return not event.is_set()
+        return not event.wait(seconds)
+
+    def __get_site_torrents(self, url: str, site, image_xpath, index,
+                            cancel_event: Optional[threading.Event] = None):
+        """
+        查询站点资源，已取消时不再请求详情页
+        """
+        page_source = self.__get_page_source(url=url, site=site, cancel_event=cancel_event)
         if not page_source:
             logger.error(f"请求站点 {site.name} 失败")
             return None
@@ -624,8 +1225,12 @@ class ShortPlayMonitor2(_PluginBase):
             logger.error(f"未检索到站点 {site.name} 资源")
             return None
 
+        if cancel_event and cancel_event.is_set():
+            return None
+
         # 获取种子详情页
-        torrent_detail_source = self.__get_page_source(url=torrents[0].get("page_url"), site=site)
+        torrent_detail_source = self.__get_page_source(url=torrents[0].get("page_url"), site=site,
+                                                       cancel_event=cancel_event)
         if not torrent_detail_source:
             logger.error(f"请求种子详情页失败 {torrents[0].get('page_url')}")
             return None
@@ -635,42 +1240,34 @@ class ShortPlayMonitor2(_PluginBase):
             logger.error(f"请求种子详情页失败 {torrents[0].get('page_url')}")
             return None
 
-        image = html.xpath(image_xpath)[0]
+        images = html.xpath(image_xpath)
+        image = images[0] if images else None
         if not image:
             logger.error(f"未获取到种子封面图 {torrents[0].get('page_url')}")
             return None
 
         return str(image)
 
-    def __get_page_source(self, url: str, site):
+    def __get_page_source(self, url: str, site, cancel_event: Optional[threading.Event] = None):
         """
-        获取页面资源，带详细日志的3次重试
+        获取页面资源，带详细日志的3次重试，复用站点会话并限制请求频率；已取消时不再重试
         """
         last_err = None
         for i in range(3):
+            # 指数退避并加入随机抖动，避免站点异常时集中重试；等待期间取消则不再请求
+            if i and not self.__wait(self._retry_backoff * 2 ** (i - 1) * random.uniform(0.5, 1.5),
+                                     cancel_event=cancel_event):
+                return ""
             try:
+                if not self.__wait_rate_limit(url, cancel_event=cancel_event):
+                    return ""
                 ret = RequestUtils(
                     cookies=site.cookie,
                     timeout=30,
+                    session=self.__get_session(url),
                 ).get_res(url, allow_redirects=True)
                 if ret is not None:
-                    # 使用chardet检测字符编码
-                    raw_data = ret.content
-                    if raw_data:
-                        try:
-                            result = chardet.detect(raw_data)
-                            encoding = result['encoding']
-                            # 解码为字符串
-                            page_source = raw_data.decode(encoding)
-                        except Exception as e:
-                            # 探测utf-8解码
-                            if re.search(r"charset=\"?utf-8\"?", ret.text, re.IGNORECASE):
-                                ret.encoding = "utf-8"
-                            else:
-                                ret.encoding = ret.apparent_encoding
-                            page_source = ret.text
-                    else:
-                        page_source = ret.text
+                    page_source = self.__decode_page(ret=ret, url=url) if ret.content else ret.text
                 else:
                     page_source = ""
                 if page_source:
@@ -685,56 +1282,151 @@ class ShortPlayMonitor2(_PluginBase):
             logger.error(str(last_err))
         return ""
 
-    def gen_file_thumb(self, title: str, file_path: Path, rename_conf: str):
+    @staticmethod
+    def __decode_page(ret, url: str) -> str:
+        """
+        页面解码：依次使用响应头声明的编码、页面开头 <meta> 声明的编码、严格 UTF-8，
+        都不可用时才对页面开头部分做编码探测。
+        iso-8859-1/windows-1252 等单字节编码能解码任意字节，解码成功不代表编码正确（站点常把 GBK 页面
+        声明为 iso-8859-1），因此不作为候选，此时以 <meta>、UTF-8 与编码探测为准
         """
-        处理一个文件，优先站点封面，失败则视频截图
+        started = time.perf_counter()
+        raw_data = ret.content
+        candidates = []
+        matched = re.search(r"charset=[\"']?([\w-]+)", ret.headers.get("Content-Type") or "", re.IGNORECASE)
+        if matched:
+            candidates.append(("响应头", matched.group(1)))
+        matched = re.search(rb"<meta[^>]+charset=[\"']?([\w-]+)", raw_data[:4096], re.IGNORECASE)
+        if matched:
+            candidates.append(("meta", matched.group(1).decode("ascii")))
+        candidates.append(("utf-8", "utf-8"))
+        for source, encoding in candidates:
+            if re.sub(r"[-_]", "", encoding.lower()) in ("iso88591", "latin1", "l1", "windows1252", "cp1252"):
+                logger.debug(f"页面{source}声明的编码 {encoding} 为单字节编码，不作为依据：{url}")
+                continue
+            # gb2312/gbk 页面中常混有扩展字符，统一按超集 gb18030 解码
+            if encoding.lower().replace("-", "") in ("gb2312", "gbk"):
+                encoding = "gb18030"
+            try:
+                page_source = raw_data.decode(encoding)
+                logger.debug(f"页面解码 {encoding}（{source}）耗时 "
+                             f"{(time.perf_counter() - started) * 1000:.1f} 毫秒：{url}")
+                return page_source
+            except (LookupError, UnicodeDecodeError):
+                continue
+        encoding = chardet.detect(raw_data[:32768]).get("encoding") or "utf-8"
+        page_source = raw_data.decode(encoding, errors="replace")
+        logger.debug(f"页面解码 {encoding}（探测）耗时 {(time.perf_counter() - started) * 1000:.1f} 毫秒：{url}")
+        return page_source
+
+    def gen_file_thumb(self, title: str, file_path: Path, rename_conf: str) -> Optional[bytes]:
+        """
+        处理一个文件，优先站点封面，失败则视频截图；图片数据直接在内存中传递，不落临时文件
         """
-        thumb_path_site = file_path.with_name(file_path.stem + "-site.jpg")
-        thumb_path_ffmpeg = file_path.with_name(file_path.stem + "-thumb.jpg")
         # 智能重命名时优先站点
         if str(rename_conf) == "smart":
-            if thumb_path_site.exists():
-                logger.info(f"缩略图已存在：{thumb_path_site}")
-                return thumb_path_site
-            result = self.gen_file_thumb_from_site(title=title, file_path=thumb_path_site)
-            if result and Path(result).exists():
-                logger.info(f"{file_path} 站点缩略图已生成：{thumb_path_site}")
-                return thumb_path_site
+            data = self.gen_file_thumb_from_site(title=title)
+            if data:
+                logger.info(f"{file_path} 站点缩略图已获取")
+                return data
             # 站点失败，尝试视频截图
             logger.info(f"{file_path} 站点缩略图获取失败，尝试视频截图 ...")
-        # 视频截图兜底
-        with ffmpeg_lock:
-            try:
-                if thumb_path_ffmpeg.exists():
-                    logger.info(f"缩略图已存在：{thumb_path_ffmpeg}")
-                    return thumb_path_ffmpeg
-                self.get_thumb(video_path=str(file_path),
-                               image_path=str(thumb_path_ffmpeg),
-                               frames=self._timeline)
-                if Path(thumb_path_ffmpeg).exists():
-                    logger.info(f"{file_path} 视频截图缩略图已生成：{thumb_path_ffmpeg}")
-                    return thumb_path_ffmpeg
-            except Exception as err:
-                logger.error(f"FFmpeg处理文件 {file_path} 时发生错误：{str(err)}")
-                return None
+        # 视频截图兜底，并发数由 ffmpeg 执行器控制
+        try:
+            started = time.perf_counter()
+            data = None
+            mode = "快速"
+            if self._thumb_mode == "fast":
+                data = self.get_thumb_fast(video_path=str(file_path), frames=self._timeline)
+            if not data:
+                mode = "逐帧"
+                data = self.get_thumb_data(video_path=str(file_path), frames=self._timeline)
+            logger.info(f"{file_path.name} {mode}截图耗时 {time.perf_counter() - started:.2f} 秒")
+            if data:
+                logger.info(f"{file_path} 视频截图缩略图已生成")
+            return data
+        except Exception as err:
+            logger.error(f"FFmpeg处理文件 {file_path} 时发生错误：{str(err)}")
+            return None
 
     @staticmethod
-    def get_thumb(video_path: str, image_path: str, frames: str = None):
-        """
-        使用ffmpeg从视频文件中截取缩略图
-        """
-        if not frames:
-            frames = "00:00:10"
-        if not video_path or not image_path:
-            return False
-        cmd = 'ffmpeg -y -i "{video_path}" -ss {frames} -frames 1 "{image_path}"'.format(
-            video_path=video_path,
-            frames=frames,
-            image_path=image_path)
-        result = SystemUtils.execute(cmd)
-        if result:
-            return True
-        return False
+    def get_thumb_data(video_path: str, frames: str = None) -> Optional[bytes]:
+        """
+        使用ffmpeg从视频文件中截取缩略图，通过管道返回 JPEG 数据
+        """
+        if not video_path:
+            return None
+        returncode, stdout, stderr = ffmpeg_executor.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", video_path, "-ss", frames or "00:00:10",
+             "-frames:v", "1", "-f", "image2pipe", "-c:v", "mjpeg", "-q:v", "2", "pipe:1"])
+        if returncode == 0 and stdout:
+            return stdout
+        logger.error(f"ffmpeg 截图失败 {video_path}：{stderr.decode(errors='ignore')[-500:]}")
+        return None
+
+    @staticmethod
+    def get_thumb_fast(video_path: str, frames: str = None, candidates: int = 5) -> Optional[bytes]:
+        """
+        快速截图：只解码关键帧并从指定时间处输入定位，一次调用输出多帧低分辨率灰度图，
+        在内存中挑选非黑屏且细节最丰富的一帧，再按该帧时间截取原始分辨率图片，通过管道返回 JPEG 数据。
+        分两次调用：第二次从选中的关键帧处输入定位，只解码一帧；若在第一次调用中直接输出全部候选帧的
+        原始分辨率 JPEG，4K 视频每帧的编码开销高于再启动一次 ffmpeg（见 tests/bench_thumb.py）
+        """
+        if not video_path:
+            return None
+        seek = ShortPlayMonitor2.__parse_timeline(frames or "00:00:10")
+        width, height = 96, 54
+        returncode, stdout, stderr = ffmpeg_executor.run(
+            ["ffmpeg", "-hide_banner", "-nostats", "-loglevel", "info",
+             "-skip_frame", "nokey", "-ss", f"{seek:.3f}", "-i", video_path,
+             "-vf", f"scale={width}:{height},format=gray,showinfo", "-vsync", "0",
+             "-frames:v", str(candidates), "-f", "rawvideo", "-pix_fmt", "gray", "pipe:1"])
+        frame_size = width * height
+        if returncode != 0 or len(stdout) < frame_size:
+            logger.debug(f"快速截图未获取到候选帧 {video_path}：{stderr.decode(errors='ignore')[-300:]}")
+            return None
+        # showinfo 输出的时间为相对定位点的时间
+        pts_times = [float(t) for t in re.findall(r"pts_time:\s*(-?[\d.]+)", stderr.decode(errors="ignore"))]
+        best_time, best_score = None, None
+        for i in range(min(len(stdout) // frame_size, len(pts_times))):
+            mean, stddev, entropy = ShortPlayMonitor2.__score_frame(stdout[i * frame_size:(i + 1) * frame_size])
+            # 黑屏/纯色帧（片头、转场）降级，只在没有其它候选时使用
+            score = (mean >= 16 and stddev >= 8, entropy, stddev)
+            if best_score is None or score > best_score:
+                best_time, best_score = seek + max(0.0, pts_times[i]), score
+        if best_time is None:
+            return None
+        returncode, stdout, stderr = ffmpeg_executor.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-ss", f"{best_time:.3f}", "-i", video_path,
+             "-frames:v", "1", "-f", "image2pipe", "-c:v", "mjpeg", "-q:v", "2", "pipe:1"])
+        if returncode != 0 or not stdout:
+            logger.debug(f"快速截图截取原图失败 {video_path}：{stderr.decode(errors='ignore')[-300:]}")
+            return None
+        return stdout
+
+    @staticmethod
+    def __parse_timeline(timeline: str) -> float:
+        """
+        将 HH:MM:SS(.ms) 或秒数转换为秒
+        """
+        seconds = 0.0
+        for part in str(timeline).split(":"):
+            seconds = seconds * 60 + float(part or 0)
+        return seconds
+
+    @staticmethod
+    def __score_frame(data: bytes) -> Tuple[float, float, float]:
+        """
+        灰度帧的平均亮度、标准差与直方图熵
+        """
+        total = len(data)
+        histogram = [0] * 256
+        for value in data:
+            histogram[value] += 1
+        mean = sum(value * count for value, count in enumerate(histogram)) / total
+        variance = sum(count * (value - mean) ** 2 for value, count in enumerate(histogram)) / total
+        entropy = -sum(count / total * math.log2(count / total) for count in histogram if count)
+        return mean, math.sqrt(variance), entropy
 
     def __update_config(self):
         """
@@ -749,7 +1441,13 @@ class ShortPlayMonitor2(_PluginBase):
             "notify": self._notify,
             "image": self._image,
             "monitor_confs": self._monitor_confs,
-            "proxy": getattr(self, 'proxy', "")
+            "proxy": getattr(self, 'proxy', ""),
+            "debounce": self._debounce,
+            "workers": self._workers,
+            "ffmpeg_workers": self._ffmpeg_workers,
+            "ffmpeg_timeout": self._ffmpeg_timeout,
+            "thumb_mode": self._thumb_mode,
+            "cover_sources": self._cover_sources
         })
 
     def get_state(self) -> bool:
@@ -880,6 +1578,94 @@ class ShortPlayMonitor2(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'debounce',
+                                            'label': '文件稳定等待(秒)',
+                                            'placeholder': '5，0为立即处理'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'workers',
+                                            'label': '处理线程数',
+                                            'placeholder': '2'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'ffmpeg_workers',
+                                            'label': 'ffmpeg并发数',
+                                            'placeholder': '2'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'ffmpeg_timeout',
+                                            'label': 'ffmpeg超时(秒)',
+                                            'placeholder': '60'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'model': 'thumb_mode',
+                                            'label': '截图模式',
+                                            'items': [
+                                                {'title': '快速（关键帧择优）', 'value': 'fast'},
+                                                {'title': '逐帧（精确时间）', 'value': 'accurate'},
+                                            ]
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -970,6 +1756,28 @@ class ShortPlayMonitor2(_PluginBase):
                             }
                         ]
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextarea',
+                                        'props': {
+                                            'model': 'cover_sources',
+                                            'label': '封面来源',
+                                            'rows': 6,
+                                            'placeholder': '留空使用默认来源（AGSV、ilolicon）。JSON数组，每项包含 domain、url（{cat}、{title} 会被替换）、cat、xpath、priority（越小越优先）'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         'component': 'VRow',
                         'content': [
@@ -1005,7 +1813,7 @@ class ShortPlayMonitor2(_PluginBase):
                                         'props': {
                                             'type': 'info',
                                             'variant': 'tonal',
-                                            'text': 'NFO文件由本地生成，仅含标题。封面获取顺序：站点(AGSV/ilolicon) > 视频截图。'
+                                            'text': 'NFO文件由本地生成，仅含标题。封面获取顺序：站点（按封面来源配置并发检索，取优先级最高的结果）> 视频截图。'
                                         }
                                     }
                                 ]
@@ -1044,7 +1852,13 @@ class ShortPlayMonitor2(_PluginBase):
             "monitor_confs": "",
             "exclude_keywords": "",
             "transfer_type": "link",
-            "proxy": ""
+            "proxy": "",
+            "debounce": 5,
+            "workers": 2,
+            "ffmpeg_workers": 2,
+            "ffmpeg_timeout": 60,
+            "thumb_mode": "fast",
+            "cover_sources": json.dumps(DEFAULT_COVER_SOURCES, ensure_ascii=False, indent=2)
         }
 
     def get_page(self) -> List[dict]:
@@ -1063,6 +1877,26 @@ class ShortPlayMonitor2(_PluginBase):
         except Exception as e:
             logger.error("退出插件失败：%s" % str(e))
 
+        if self._debounce_stop:
+            self._debounce_stop.set()
+            self._debounce_stop = None
+        # 排队中的任务与等待稳定的文件保留，重新启动后继续处理
+        carried = self.__drain_workers() if self._worker_stop else 0
+        with self._pending_lock:
+            waiting = len(self._pending_files)
+        if carried or waiting:
+            logger.info(f"停止处理线程，{carried} 个未处理任务、{waiting} 个等待稳定的文件将在重新启动后继续处理")
+        with self._session_lock:
+            # 取消进行中的封面检索，中断其退避与限速等待
+            for cancel_event in self._cover_cancels:
+                cancel_event.set()
+            self._cover_cancels.clear()
+            for session in self._sessions.values():
+                session.close()
+            # 类属性字典原地清空，避免实例属性遮蔽后类上残留旧会话与限速时间
+            self._sessions.clear()
+            self._rate_next.clear()
+
         if self._observer:
             for observer in self._observer:
                 try:
@@ -1,26 +1,47 @@
+import cProfile
 import datetime
+import hashlib
+import hmac
+import io
+import pstats
 import re
+import shutil
+import sys
+import threading
+import time
 import traceback
 import json
-import requests
-from typing import Optional, Any, List, Dict, Tuple
-import pytz
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from collections import Counter
+from pathlib import Path
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from typing import Optional, Any, List, Dict, Tuple, TYPE_CHECKING
+from urllib.parse import urlencode
+from fastapi import Response
+from fastapi.responses import RedirectResponse
 from app import schemas
 from app.chain.download import DownloadChain
 from app.chain.search import SearchChain
 from app.chain.subscribe import SubscribeChain
+from app.chain.torrents import TorrentsChain
 from app.core.config import settings
 from app.core.context import MediaInfo, TorrentInfo, Context
 from app.core.metainfo import MetaInfo
 from app.db.site_oper import SiteOper
+from app.db.subscribe_oper import SubscribeOper
 from app.db.systemconfig_oper import SystemConfigOper
 from app.helper.torrent import TorrentHelper
 from app.log import logger
 from app.plugins import _PluginBase
 from app.schemas import ExistMediaInfo
 from app.schemas.types import SystemConfigKey, MediaType
+from app.utils.http import RequestUtils
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+# requests、pytz、PIL、APScheduler 仅在实际使用的代码路径中导入，缩短插件加载耗时
+
 
 class SiteSubscriber(_PluginBase):
     # 插件名称
@@ -30,7 +51,7 @@ class SiteSubscriber(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/dadinet/MoviePilot-Plugins/refs/heads/main/icons/SiteSubscriber.png"
     # 插件版本
-    plugin_version = "1.1"
+    plugin_version = "1.2"
     # 插件作者
     plugin_author = "dadinet"
     # 作者主页
@@ -43,10 +64,11 @@ class SiteSubscriber(_PluginBase):
     auth_level = 2
 
     # 私有变量
-    _scheduler: Optional[BackgroundScheduler] = None
-    downloadchain = None
-    searchchain = None
-    subscribechain = None
+    _scheduler: Optional["BackgroundScheduler"] = None
+    # 处理链在首次使用时创建
+    _downloadchain: Optional[DownloadChain] = None
+    _searchchain: Optional[SearchChain] = None
+    _subscribechain: Optional[SubscribeChain] = None
 
     # 配置属性
     _enabled: bool = False
@@ -67,20 +89,84 @@ class SiteSubscriber(_PluginBase):
     _effect: str = ""
     _filter_groups: list = []
     _downloader: Optional[str] = None
-    _history: Dict[str, dict] = {}
+    # 历史记录在首次使用时加载，见 _history 属性
+    _history_data: Optional[Dict[str, dict]] = None
+    # 过滤/动作方案：JSON 数组，每项为一组独立的过滤条件与动作，未配置的字段继承基础配置
+    _profiles: Any = None
     # 独立通知配置
     _independent_notify: bool = False
     _independent_notify_config: Any = None
     # 日志分组：用于不同资源之间插入空行分隔，提升可读性
     _last_log_group_key: Optional[str] = None
+    # 日志模式：detail 逐条输出处理结果；summary 逐条结果降为 debug，仅输出站点与本轮汇总
+    _log_mode: str = "detail"
+    # 处理结果计数：当前站点与本轮
+    _site_stats: Counter = Counter()
+    _run_stats: Counter = Counter()
+    # 单次运行时间预算（分钟），0 表示不限制；超出后记录游标，下次从断点继续
+    _run_budget: int = 0
+    # 运行互斥锁：定时服务与立即运行任务共用，重叠触发直接合并跳过
+    _check_lock = threading.Lock()
+    # 站点熔断：连续失败次数阈值与熔断冷却时间（分钟）
+    _breaker_threshold: int = 3
+    _breaker_cooldown: int = 60
+    # 站点拉取线程池（长期复用、有上限）与各站点仍在进行中的拉取；上次拉取未结束的站点本轮跳过，避免重复请求与线程堆积
+    _search_executor: Optional[ThreadPoolExecutor] = None
+    _search_workers: int = 4
+    _site_searches: Dict[str, Any] = {}
+    # 站点健康状态：site_id -> {latencies, failures, state, opened_at, last_error, last_time}；首次使用时加载，见 _site_health 属性
+    _site_health_data: Optional[Dict[str, dict]] = None
+    # 数据来源：search 直接检索站点；cache 优先读取系统已刷新的站点种子缓存，缺失或过期时回退检索
+    _source_mode: str = "search"
+    # 站点缓存过期时间（分钟）：缓存最新一条种子超过该时间未变化时回退直接检索一次
+    _cache_max_age: int = 60
+    # 站点缓存最新一条种子记录：site_id -> {head, since}；首次使用时加载，见 _cache_heads 属性
+    _cache_heads_data: Optional[Dict[str, dict]] = None
+    # 已处理种子索引：指纹 -> 处理时间；方案配置变化时整体失效，超过保留期或数量上限时淘汰
+    _seen_index: Optional[Dict[str, float]] = None
+    _seen_signature: Optional[str] = None
+    _seen_ttl: int = 7 * 24 * 3600
+    _seen_limit: int = 20000
+    # 下载批量提交：每个下载器的并发数与每个站点的种子获取并发数
+    _download_concurrency: int = 3
+    _site_concurrency: int = 2
+    # 本轮待提交的下载：[{key, site_id, meta, mediainfo, torrent_info, profile}]
+    _download_batch: List[dict] = []
+    # 运行性能分析：开启后每轮 check 使用 cProfile 记录，保存到插件数据目录并保留最近若干份
+    _profiler_enabled: bool = False
+    _profiler_keep: int = 5
+    # 待办复查：定期按批检查待办项是否已入库或已被订阅，已满足的自动结束；间隔（小时），0 为关闭
+    _pending_refresh_interval: int = 6
+    _pending_refresh_batch: int = 50
+    _refresh_lock = threading.Lock()
+    # 待办处理队列：确认/忽略在后台线程池中执行，接口立即返回任务ID
+    _confirm_workers: int = 2
+    _job_executor: Optional[ThreadPoolExecutor] = None
+    # 任务状态：job_id -> {id, type, key, title, status, message, time}
+    _jobs: Dict[str, dict] = {}
+    # 历史记录读写锁：check 与后台任务并发修改 _history 时使用
+    _history_lock = threading.RLock()
+    # 历史版本计数器：待办项每次变化时写入新的 version，用于失效卡片缓存
+    _history_version: int = 0
+    # 待办卡片缓存：key -> (version, card)
+    _card_cache: Dict[str, Tuple[int, dict]] = {}
+    # 待办图片本地缓存：加入待办时预取并缩小海报/背景图，离开待办时删除
+    _image_executor: Optional[ThreadPoolExecutor] = None
+    _image_widths: Dict[str, int] = {"poster": 300, "backdrop": 780}
+    # 未结束的图片缓存任务数与是否有未保存的图片更新：不逐项保存历史，按批统一保存
+    _image_tasks: int = 0
+    _image_dirty: bool = False
+    _image_lock = threading.Lock()
+    # 独立通知：各通道并发发送，共用一个连接池会话；未配置 timeout 的通道使用默认超时（秒）
+    _notify_executor: Optional[ThreadPoolExecutor] = None
+    _notify_session: Any = None
+    _notify_timeout: int = 10
 
     def init_plugin(self, config: dict = None):
-        self.downloadchain = DownloadChain()
-        self.searchchain = SearchChain()
-        self.subscribechain = SubscribeChain()
-
-        # 停止现有任务
-        self.stop_service()
+        started = time.perf_counter()
+        # 停止现有定时任务；后台线程池保留，保存配置时不丢弃排队中的待办任务
+        self.__stop_scheduler()
+        confirm_workers = self._confirm_workers
 
         # 配置
         if config:
@@ -96,21 +182,49 @@ class SiteSubscriber(_PluginBase):
             self._action = config.get("action")
             self._save_path = config.get("save_path")
             self._size_range = config.get("size_range")
+            self._run_budget = int(config.get("run_budget") or 0)
+            self._breaker_threshold = int(config.get("breaker_threshold") or 3)
+            self._breaker_cooldown = int(config.get("breaker_cooldown") or 60)
+            self._confirm_workers = int(config.get("confirm_workers") or 2)
+            self._source_mode = config.get("source_mode") or "search"
+            self._download_concurrency = int(config.get("download_concurrency") or 3)
+            self._profiler_enabled = config.get("profiler_enabled") or False
+            self._profiler_keep = int(config.get("profiler_keep") or 5)
+            self._log_mode = config.get("log_mode") or "detail"
+            pending_refresh_interval = config.get("pending_refresh_interval")
+            self._pending_refresh_interval = int(pending_refresh_interval) \
+                if pending_refresh_interval not in (None, "") else 6
+            self._site_concurrency = int(config.get("site_concurrency") or 2)
+            self._cache_max_age = int(config.get("cache_max_age") or 60)
             # 加载新增的订阅过滤配置
             self._quality = config.get("quality")
             self._resolution = config.get("resolution")
             self._effect = config.get("effect")
             self._filter_groups = config.get("filter_groups")
             self._downloader = config.get("downloader")
+            self._profiles = config.get("profiles")
             # 加载独立通知配置
             self._independent_notify = config.get("independent_notify") or False
             self._independent_notify_config = config.get("independent_notify_config")
 
-        # 加载历史记录
-        self._history = self.get_data('history') or {}
+        # 待办处理线程数变化时才重建线程池：旧线程池不再接收新任务，已排队的任务继续执行完
+        if self._job_executor and self._confirm_workers != confirm_workers:
+            self._job_executor.shutdown(wait=False)
+            self._job_executor = None
+
+        # 历史记录、已处理索引、站点健康状态与缓存记录均在首次使用时加载，插件未启用时不读取；
+        # 仍有待办任务在处理时保留内存中的历史记录
+        if not self.__get_active_job_keys():
+            self._history_data = None
+            self._card_cache = {}
+        self._seen_index = None
+        self._site_health_data = None
+        self._cache_heads_data = None
 
         # 配置保存后立即执行一次，通常用于手动触发
         if self._onlyonce:
+            import pytz
+            from apscheduler.schedulers.background import BackgroundScheduler
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
             logger.info(f"站点资源订阅服务启动，准备立即运行一次，站点: {self._address}")
             self._scheduler.add_job(func=self.check, trigger='date',
@@ -134,6 +248,74 @@ class SiteSubscriber(_PluginBase):
             # 保存设置
             self.__update_config()
 
+        logger.debug(f"站点资源订阅插件加载耗时 {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    @property
+    def _history(self) -> Dict[str, dict]:
+        """
+        历史记录，首次访问时加载并初始化版本计数器
+        """
+        if self._history_data is None:
+            with self._history_lock:
+                if self._history_data is None:
+                    history = self.get_data('history') or {}
+                    # 兼容旧版本落盘的“下载中”记录：视为下载失败，下次运行重试
+                    for item in history.values():
+                        if item.get("status") == "downloading":
+                            item["status"] = "download_failed"
+                            item["message"] = "上次运行中断，下载未提交"
+                    self._history_version = max([int(item.get("version") or 0) for item in history.values()] or [0])
+                    self._history_data = history
+        return self._history_data
+
+    @_history.setter
+    def _history(self, value: Dict[str, dict]):
+        self._history_data = value
+
+    @property
+    def _site_health(self) -> Dict[str, dict]:
+        """
+        站点健康状态，首次访问时加载
+        """
+        if self._site_health_data is None:
+            self._site_health_data = self.get_data('site_health') or {}
+        return self._site_health_data
+
+    @_site_health.setter
+    def _site_health(self, value: Dict[str, dict]):
+        self._site_health_data = value
+
+    @property
+    def _cache_heads(self) -> Dict[str, dict]:
+        """
+        站点缓存最新一条种子记录，首次访问时加载
+        """
+        if self._cache_heads_data is None:
+            self._cache_heads_data = self.get_data('cache_heads') or {}
+        return self._cache_heads_data
+
+    @_cache_heads.setter
+    def _cache_heads(self, value: Dict[str, dict]):
+        self._cache_heads_data = value
+
+    @property
+    def downloadchain(self) -> DownloadChain:
+        if self._downloadchain is None:
+            self._downloadchain = DownloadChain()
+        return self._downloadchain
+
+    @property
+    def searchchain(self) -> SearchChain:
+        if self._searchchain is None:
+            self._searchchain = SearchChain()
+        return self._searchchain
+
+    @property
+    def subscribechain(self) -> SubscribeChain:
+        if self._subscribechain is None:
+            self._subscribechain = SubscribeChain()
+        return self._subscribechain
+
     def get_state(self) -> bool:
         return self._enabled
 
@@ -154,6 +336,32 @@ class SiteSubscriber(_PluginBase):
                 "endpoint": self.ignore_item,
                 "methods": ["GET"],
                 "summary": "忽略待办事项"
+            },
+            {
+                "path": "/confirm_items",
+                "endpoint": self.confirm_items,
+                "methods": ["GET"],
+                "summary": "批量确认待办事项"
+            },
+            {
+                "path": "/ignore_items",
+                "endpoint": self.ignore_items,
+                "methods": ["GET"],
+                "summary": "批量忽略待办事项"
+            },
+            {
+                "path": "/image",
+                "endpoint": self.get_image,
+                "methods": ["GET"],
+                "summary": "获取待办项本地缓存图片",
+                # 由接口自行校验图片签名或 API 密钥，页面 <img> 地址中不携带 API 密钥
+                "allow_anonymous": True
+            },
+            {
+                "path": "/job_status",
+                "endpoint": self.job_status,
+                "methods": ["GET"],
+                "summary": "查询待办处理任务状态"
             }
         ]
 
@@ -161,23 +369,35 @@ class SiteSubscriber(_PluginBase):
         """
         注册插件公共服务
         """
-        if self._enabled and self._cron:
-            return [{
+        if not self._enabled:
+            return []
+        services = []
+        if self._cron:
+            from apscheduler.triggers.cron import CronTrigger
+            services.append({
                 "id": "SiteSubscriber",
                 "name": "站点资源订阅服务",
                 "trigger": CronTrigger.from_crontab(self._cron),
                 "func": self.check,
                 "kwargs": {}
-            }]
-        elif self._enabled:
-            return [{
+            })
+        else:
+            services.append({
                 "id": "SiteSubscriber",
                 "name": "站点资源订阅服务",
                 "trigger": "interval",
                 "func": self.check,
                 "kwargs": {"minutes": 30}
-            }]
-        return []
+            })
+        if self._pending_refresh_interval:
+            services.append({
+                "id": "SiteSubscriberPendingRefresh",
+                "name": "站点资源订阅待办复查",
+                "trigger": "interval",
+                "func": self.refresh_pending,
+                "kwargs": {"hours": self._pending_refresh_interval}
+            })
+        return services
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         """
@@ -216,12 +436,17 @@ class SiteSubscriber(_PluginBase):
                         'content': [
                             {
                                 'component': 'VCol',
-                                'props': {'cols': 12, 'md': 6},
+                                'props': {'cols': 12, 'md': 4},
                                 'content': [{'component': 'VTextField', 'props': {'model': 'cron', 'label': '执行周期', 'placeholder': '5位cron表达式，留空自动'}}]
                             },
                             {
                                 'component': 'VCol',
-                                'props': {'cols': 12, 'md': 6},
+                                'props': {'cols': 12, 'md': 4},
+                                'content': [{'component': 'VTextField', 'props': {'model': 'run_budget', 'label': '单次运行时长上限(分钟)', 'placeholder': '0为不限制，超时后下次从断点继续'}}]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 4},
                                 'content': [{'component': 'VSelect', 'props': {'model': 'action', 'label': '动作', 'items': [{'title': '手动订阅', 'value': 'manual_subscribe'}, {'title': '自动订阅', 'value': 'auto_subscribe'}, {'title': '下载', 'value': 'download'}]}}]
                             }
                         ]
@@ -303,6 +528,25 @@ class SiteSubscriber(_PluginBase):
                             {'component': 'VCol', 'props': {'cols': 12, 'md': 6}, 'content': [{'component': 'VTextField', 'props': {'model': 'exclude', 'label': '排除', 'placeholder': '支持正则表达式'}}]}
                         ]
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 4}, 'content': [{'component': 'VTextField', 'props': {'model': 'breaker_threshold', 'label': '站点熔断阈值(连续失败次数)', 'placeholder': '3'}}]},
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 4}, 'content': [{'component': 'VTextField', 'props': {'model': 'breaker_cooldown', 'label': '站点熔断冷却(分钟)', 'placeholder': '60'}}]},
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 4}, 'content': [{'component': 'VTextField', 'props': {'model': 'confirm_workers', 'label': '待办后台处理并发数', 'placeholder': '2'}}]}
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 6}, 'content': [{'component': 'VTextField', 'props': {'model': 'download_concurrency', 'label': '每个下载器并发提交数', 'placeholder': '3'}}]},
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 6}, 'content': [{'component': 'VTextField', 'props': {'model': 'site_concurrency', 'label': '每个站点并发获取种子数', 'placeholder': '2'}}]},
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 6}, 'content': [{'component': 'VSelect', 'props': {'model': 'source_mode', 'label': '数据来源', 'items': [{'title': '直接检索站点', 'value': 'search'}, {'title': '优先使用系统站点缓存', 'value': 'cache'}]}}]},
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 6}, 'content': [{'component': 'VTextField', 'props': {'model': 'cache_max_age', 'label': '站点缓存过期时间(分钟)', 'placeholder': '60'}}]},
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 6}, 'content': [{'component': 'VTextField', 'props': {'model': 'pending_refresh_interval', 'label': '待办复查间隔(小时)', 'placeholder': '6，0为关闭'}}]},
+                            {'component': 'VCol', 'props': {'cols': 12, 'md': 6}, 'content': [{'component': 'VSelect', 'props': {'model': 'log_mode', 'label': '日志模式', 'items': [{'title': '逐条详细', 'value': 'detail'}, {'title': '汇总', 'value': 'summary'}]}}]}
+                        ]
+                    },
                     {
                         'component': 'VRow',
                         'content': [
@@ -335,8 +579,107 @@ class SiteSubscriber(_PluginBase):
                                 ]
                             }
                         ]
-                    }
-                    ,
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 4},
+                                'content': [
+                                    {'component': 'VSwitch', 'props': {'model': 'profile_dialog_open', 'label': '打开多方案设置窗口'}}
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 4},
+                                'content': [
+                                    {'component': 'VSwitch', 'props': {'model': 'profiler_enabled', 'label': '运行性能分析'}}
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 4},
+                                'content': [
+                                    {'component': 'VTextField', 'props': {'model': 'profiler_keep', 'label': '性能分析保留份数', 'placeholder': '5'}}
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        "component": "VDialog",
+                        "props": {
+                            "model": "profile_dialog_open",
+                            "max-width": "65rem",
+                            "overlay-class": "v-dialog--scrollable v-overlay--scroll-blocked",
+                            "content-class": "v-card v-card--density-default v-card--variant-elevated rounded-t"
+                        },
+                        "content": [
+                            {
+                                "component": "VCard",
+                                "props": {
+                                    "title": "设置过滤/动作方案"
+                                },
+                                "content": [
+                                    {
+                                        "component": "VDialogCloseBtn",
+                                        "props": {
+                                            "model": "profile_dialog_open"
+                                        }
+                                    },
+                                    {
+                                        "component": "VCardText",
+                                        "props": {},
+                                        "content": [
+                                            {
+                                                'component': 'VRow',
+                                                'content': [
+                                                    {
+                                                        'component': 'VCol',
+                                                        'props': {
+                                                            'cols': 12,
+                                                        },
+                                                        'content': [
+                                                            {
+                                                                'component': 'VAceEditor',
+                                                                'props': {
+                                                                    'modelvalue': 'profiles',
+                                                                    'lang': 'json',
+                                                                    'theme': 'monokai',
+                                                                    'style': 'height: 30rem',
+                                                                }
+                                                            }
+                                                        ]
+                                                    }
+                                                ]
+                                            },
+                                            {
+                                                'component': 'VRow',
+                                                'content': [
+                                                    {
+                                                        'component': 'VCol',
+                                                        'props': {
+                                                            'cols': 12,
+                                                        },
+                                                        'content': [
+                                                            {
+                                                                'component': 'VAlert',
+                                                                'props': {
+                                                                    'type': 'info',
+                                                                    'variant': 'tonal',
+                                                                    'text': '说明：每个方案需设置唯一的 name，可设置 action、include、exclude、quality、resolution、effect、filter_groups、size_range、downloader、save_path，未设置的字段继承基础配置。基础配置作为默认方案始终生效，所有方案共用一次站点拉取与媒体识别。'
+                                                                }
+                                                            }
+                                                        ]
+                                                    }
+                                                ]
+                                            }
+                                        ]
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         "component": "VDialog",
                         "props": {
@@ -398,7 +741,7 @@ class SiteSubscriber(_PluginBase):
                                                                 'props': {
                                                                     'type': 'info',
                                                                     'variant': 'tonal',
-                                                                    'text': '说明：目前仅支持Telegram通知。'
+                                                                    'text': '说明：支持 telegram（token、chat_id、proxy）、webhook（url、method、headers）、bark（key、server、group）三种通道，可配置多个，各通道并发发送；每个通道可单独设置 timeout（秒，默认10）。'
                                                                 }
                                                             }
                                                         ]
@@ -417,8 +760,12 @@ class SiteSubscriber(_PluginBase):
             "enabled": False, "notify": True, "onlyonce": False, "cron": "*/30 * * * *",
             "address": [], "include": "", "exclude": "", "quality": "全部", "resolution": "全部",
             "effect": "全部", "filter_groups": [], "downloader": None,
-            "clear": False, "action": "manual_subscribe", "save_path": "", "size_range": "",
+            "clear": False, "action": "manual_subscribe", "save_path": "", "size_range": "", "run_budget": 0,
+            "breaker_threshold": 3, "breaker_cooldown": 60, "confirm_workers": 2,
+            "source_mode": "search", "cache_max_age": 60, "download_concurrency": 3, "site_concurrency": 2,
             "independent_notify": False, "notify_dialog_open": False,
+            "profile_dialog_open": False, "profiles": "[]", "profiler_enabled": False, "profiler_keep": 5,
+            "log_mode": "detail", "pending_refresh_interval": 6,
             "independent_notify_config": """[\n    {\n        \"channel\": \"telegram\",\n        \"token\": \"123456:ABC-DEF1234567890\",\n        \"chat_id\": \"-1001234567890\",\n        \"proxy\": true\n    }\n]"""
         }
 
@@ -427,139 +774,298 @@ class SiteSubscriber(_PluginBase):
         拼装插件详情页面
         """
         # 仅展示状态为 pending 的待办项，由新逻辑保证每项都含唯一键 key
-        pending_list = [item for item in self._history.values() if item.get("status") == "pending"]
-        logger.info(f"待确认列表：{pending_list}")
-        
+        # 已在后台处理中的待办项不再展示操作按钮，改为在顶部汇总展示
+        active_keys = self.__get_active_job_keys()
+        pending_list = [item for item in self._history.values()
+                        if item.get("status") == "pending" and item.get("key") not in active_keys]
+        logger.debug(f"待确认列表：{len(pending_list)} 项")
+
+        health_page = self.__get_site_health_page() + self.__get_job_page()
         if not pending_list:
-            return [{'component': 'div', 'text': '暂无待确认数据', 'props': {'class': 'text-center'}}]
+            return health_page + [{'component': 'div', 'text': '暂无待确认数据', 'props': {'class': 'text-center'}}]
 
         pending_list = sorted(pending_list, key=lambda x: x.get('time'), reverse=True)
         contents = []
         for item in pending_list:
+            # 卡片按待办项版本缓存，仅当该待办项变化时重新生成
             item_key = item.get("key")
-            # 计算展示用集数状态
-            total_eps = item.get('total_episodes') or 0
-            latest_ep = item.get('latest_episode') or 0
-            status_text = ''
-            if total_eps and latest_ep and latest_ep >= total_eps:
-                status_text = f"完结({total_eps})"
-            elif total_eps and latest_ep:
-                status_text = f"({latest_ep}//{total_eps})"
-            elif total_eps:
-                status_text = f"完结({total_eps})"
-            # 根据状态选择徽标颜色
-            status_color = None
-            if status_text:
-                status_color = 'success' if status_text.startswith('完结') else 'warning'
-            # 圆点颜色（不使用组件色名，明确到具体颜色值）
-            status_dot_color = None
-            if status_color == 'success':
-                status_dot_color = '#4CAF50'
-            elif status_color == 'warning':
-                status_dot_color = '#FF9800'
-            contents.append({
-                'component': 'VCard',
-                'props': {
-                    'image': item.get("mediainfo", {}).get('backdrop_path'),
-                    'class': 'flex flex-col h-full',
-                    'style': 'min-height: 140px'
-                },
-                'content': [
-                    {
-                        'component': 'div',
-                        'props': {'class': 'absolute inset-0', 'style': 'background-image: linear-gradient(to top, rgba(0,0,0,0.9), rgba(0,0,0,0.5));'}
-                    },
-                    *([
+            version = int(item.get("version") or 0)
+            cached = self._card_cache.get(item_key)
+            if not cached or cached[0] != version:
+                cached = (version, self.__render_card(item))
+                self._card_cache[item_key] = cached
+            contents.append(cached[1])
+        # 清理已不在待办列表中的卡片缓存
+        pending_keys = {item.get("key") for item in pending_list}
+        for cache_key in [k for k in self._card_cache.keys() if k not in pending_keys]:
+            self._card_cache.pop(cache_key, None)
+
+        batch_actions = {
+            'component': 'div',
+            'props': {'class': 'd-flex ga-2 mb-3 align-center'},
+            'content': [
+                {'component': 'div', 'props': {'class': 'text-subtitle-1'}, 'text': f'待确认 {len(pending_list)} 项'},
+                {'component': 'VSpacer'},
+                self.__render_bulk_button(text='全部确认', color='primary', api='confirm_items',
+                                          message=f'确认将全部 {len(pending_list)} 项待办加入处理队列？'),
+                self.__render_bulk_button(text='全部忽略', color='error', api='ignore_items',
+                                          message=f'确认忽略全部 {len(pending_list)} 项待办？')
+            ]
+        }
+        return health_page + [batch_actions,
+                              {'component': 'div', 'props': {'class': 'grid gap-3 grid-info-card'}, 'content': contents}]
+
+    @staticmethod
+    def __render_bulk_button(text: str, color: str, api: str, message: str) -> dict:
+        """
+        批量操作按钮：点击后弹出确认框，确认后才调用批量接口
+        """
+        return {
+            'component': 'VBtn',
+            'props': {'color': color, 'variant': 'tonal'},
+            'text': text,
+            'content': [
+                {
+                    'component': 'VMenu',
+                    'props': {'activator': 'parent', 'location': 'bottom end'},
+                    'content': [
                         {
-                            'component': 'div',
-                            'props': {
-                                'class': 'absolute right-2 top-2 z-20 flex items-center gap-2 px-2 py-1 rounded',
-                                'style': 'background-color: rgba(0,0,0,0.45);'
-                            },
+                            'component': 'VCard',
+                            'props': {'class': 'pa-3'},
                             'content': [
+                                {'component': 'div', 'props': {'class': 'mb-3'}, 'text': message},
                                 {
                                     'component': 'div',
-                                    'props': {'class': 'text-white text-caption'},
-                                    'text': status_text
-                                },
-                                {
-                                    'component': 'div',
-                                    'props': {
-                                        'style': f'width: 14px; height: 14px; border-radius: 9999px; background-color: {status_dot_color};'
-                                    }
+                                    'props': {'class': 'd-flex justify-end ga-2'},
+                                    'content': [
+                                        {'component': 'VBtn', 'props': {'variant': 'text'}, 'text': '取消'},
+                                        {
+                                            'component': 'VBtn',
+                                            'props': {'color': color, 'variant': 'flat'},
+                                            'text': text,
+                                            'events': {
+                                                'click': {
+                                                    'api': f'plugin/SiteSubscriber/{api}', 'method': 'get',
+                                                    'params': {'apikey': settings.API_TOKEN},
+                                                    'refresh': True
+                                                }
+                                            }
+                                        }
+                                    ]
                                 }
                             ]
                         }
-                    ] if status_text else []),
+                    ]
+                }
+            ]
+        }
+
+    def __render_card(self, item: dict) -> dict:
+        """
+        生成单个待办项卡片
+        """
+        item_key = item.get("key")
+        # 计算展示用集数状态
+        total_eps = item.get('total_episodes') or 0
+        latest_ep = item.get('latest_episode') or 0
+        status_text = ''
+        if total_eps and latest_ep and latest_ep >= total_eps:
+            status_text = f"完结({total_eps})"
+        elif total_eps and latest_ep:
+            status_text = f"({latest_ep}//{total_eps})"
+        elif total_eps:
+            status_text = f"完结({total_eps})"
+        # 根据状态选择徽标颜色
+        status_color = None
+        if status_text:
+            status_color = 'success' if status_text.startswith('完结') else 'warning'
+        # 圆点颜色（不使用组件色名，明确到具体颜色值）
+        status_dot_color = None
+        if status_color == 'success':
+            status_dot_color = '#4CAF50'
+        elif status_color == 'warning':
+            status_dot_color = '#FF9800'
+        return {
+            'component': 'VCard',
+            'props': {
+                'image': self.__get_image_url(item, "backdrop"),
+                'class': 'flex flex-col h-full',
+                'style': 'min-height: 140px'
+            },
+            'content': [
+                {
+                    'component': 'div',
+                    'props': {'class': 'absolute inset-0', 'style': 'background-image: linear-gradient(to top, rgba(0,0,0,0.9), rgba(0,0,0,0.5));'}
+                },
+                *([
                     {
                         'component': 'div',
-                        'props': {'class': 'relative z-10'},
+                        'props': {
+                            'class': 'absolute right-2 top-2 z-20 flex items-center gap-2 px-2 py-1 rounded',
+                            'style': 'background-color: rgba(0,0,0,0.45);'
+                        },
                         'content': [
                             {
                                 'component': 'div',
-                                'props': {'class': 'v-card-text flex items-center pt-3 pb-2'},
-                                'content': [
-                                    {
-                                        'component': 'div',
-                                        'props': {'class': 'h-auto w-16 flex-shrink-0 overflow-hidden rounded-md'},
-                                        'content': [
-                                            {'component': 'VImg', 'props': {'src': item.get("poster"), 'aspect-ratio': '2/3', 'cover': True}}
-                                        ]
-                                    },
-                                    {
-                                        'component': 'div',
-                                        'props': {'class': 'flex flex-col justify-center overflow-hidden pl-2 xl:pl-4'},
-                                        'content': [
-                                            {'component': 'div', 'props': {'class': 'text-sm font-medium text-white sm:pt-1'}, 'text': item.get('mediainfo', {}).get('year')},
-                                            {'component': 'div', 'props': {'class': 'mr-2 min-w-0 text-lg font-bold text-white text-ellipsis overflow-hidden line-clamp-2'}, 'text': f"{item.get('mediainfo', {}).get('title')}{f' S{str(item.get('meta', {}).get('season')).zfill(2)}' if item.get('meta', {}).get('season') else ''}"},
-                                            {'component': 'div', 'props': {'class': 'text-subtitle-2 text-white'}, 'text': f'{item.get("type")}'},
-                                            {'component': 'div', 'props': {'class': 'text-subtitle-2 text-white'}, 'text': f'{item.get("time")}'},
-                                        ]
-                                    }
-                                ]
+                                'props': {'class': 'text-white text-caption'},
+                                'text': status_text
                             },
                             {
                                 'component': 'div',
-                                'props': {'class': 'd-flex ga-2 pa-2 justify-center'},
-                                'content': [
-                                    {
-                                        'component': 'VBtn',
-                                        'props': {'color': 'primary'},
-                                        'text': '下载' if item.get("action") == "download" else '订阅',
-                                        'events': {
-                                            'click': {
-                                                'api': 'plugin/SiteSubscriber/confirm_item', 'method': 'get',
-                                                'params': {'key': item_key, 'apikey': settings.API_TOKEN},
-                                                'refresh': True
-                                            }
-                                        }
-                                    },
-                                    {
-                                        'component': 'VBtn',
-                                        'props': {'color': 'error'},
-                                        'text': '忽略',
-                                        'events': {
-                                            'click': {
-                                                'api': 'plugin/SiteSubscriber/ignore_item', 'method': 'get',
-                                                'params': {'key': item_key, 'apikey': settings.API_TOKEN},
-                                                'refresh': True
-                                            }
-                                        }
-                                    }
-                                ]
+                                'props': {
+                                    'style': f'width: 14px; height: 14px; border-radius: 9999px; background-color: {status_dot_color};'
+                                }
                             }
                         ]
                     }
+                ] if status_text else []),
+                {
+                    'component': 'div',
+                    'props': {'class': 'relative z-10'},
+                    'content': [
+                        {
+                            'component': 'div',
+                            'props': {'class': 'v-card-text flex items-center pt-3 pb-2'},
+                            'content': [
+                                {
+                                    'component': 'div',
+                                    'props': {'class': 'h-auto w-16 flex-shrink-0 overflow-hidden rounded-md'},
+                                    'content': [
+                                        {'component': 'VImg', 'props': {'src': self.__get_image_url(item, "poster"), 'aspect-ratio': '2/3', 'cover': True}}
+                                    ]
+                                },
+                                {
+                                    'component': 'div',
+                                    'props': {'class': 'flex flex-col justify-center overflow-hidden pl-2 xl:pl-4'},
+                                    'content': [
+                                        {'component': 'div', 'props': {'class': 'text-sm font-medium text-white sm:pt-1'}, 'text': item.get('mediainfo', {}).get('year')},
+                                        {'component': 'div', 'props': {'class': 'mr-2 min-w-0 text-lg font-bold text-white text-ellipsis overflow-hidden line-clamp-2'}, 'text': f"{item.get('mediainfo', {}).get('title')}{f' S{str(item.get('meta', {}).get('season')).zfill(2)}' if item.get('meta', {}).get('season') else ''}"},
+                                        {'component': 'div', 'props': {'class': 'text-subtitle-2 text-white'}, 'text': f'{item.get("type")}' + (f' · {item.get("profile")}' if item.get("profile") else '')},
+                                        {'component': 'div', 'props': {'class': 'text-subtitle-2 text-white'}, 'text': f'{item.get("time")}'},
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            'component': 'div',
+                            'props': {'class': 'd-flex ga-2 pa-2 justify-center'},
+                            'content': [
+                                {
+                                    'component': 'VBtn',
+                                    'props': {'color': 'primary'},
+                                    'text': '下载' if item.get("action") == "download" else '订阅',
+                                    'events': {
+                                        'click': {
+                                            'api': 'plugin/SiteSubscriber/confirm_item', 'method': 'get',
+                                            'params': {'key': item_key, 'apikey': settings.API_TOKEN},
+                                            'refresh': True
+                                        }
+                                    }
+                                },
+                                {
+                                    'component': 'VBtn',
+                                    'props': {'color': 'error'},
+                                    'text': '忽略',
+                                    'events': {
+                                        'click': {
+                                            'api': 'plugin/SiteSubscriber/ignore_item', 'method': 'get',
+                                            'params': {'key': item_key, 'apikey': settings.API_TOKEN},
+                                            'refresh': True
+                                        }
+                                    }
+                                }
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+
+    def __get_site_health_page(self) -> List[dict]:
+        """
+        拼装站点健康状态表格，展示被熔断跳过的站点
+        """
+        if not self._site_health:
+            return []
+        state_map = {"closed": "正常", "open": "熔断中", "half_open": "探测中"}
+        site_names = {str(site.id): site.name for site in SiteOper().list()}
+        rows = []
+        for site_id, health in self._site_health.items():
+            latencies = health.get("latencies") or []
+            avg_latency = f"{sum(latencies) / len(latencies):.1f}s" if latencies else "-"
+            state = health.get("state") or "closed"
+            if state == "open":
+                until = datetime.datetime.fromtimestamp((health.get("opened_at") or 0) + self._breaker_cooldown * 60)
+                state_text = f"{state_map[state]}（至 {until.strftime('%H:%M')}）"
+            else:
+                state_text = state_map.get(state, state)
+            rows.append({
+                'component': 'tr',
+                'content': [
+                    {'component': 'td', 'text': site_names.get(str(site_id), site_id)},
+                    {'component': 'td', 'props': {'class': 'text-error' if state == 'open' else ''}, 'text': state_text},
+                    {'component': 'td', 'text': avg_latency},
+                    {'component': 'td', 'text': f"{self._get_site_timeout(latencies)}s"},
+                    {'component': 'td', 'text': str(health.get("failures") or 0)},
+                    {'component': 'td', 'text': health.get("last_error") or "-"},
+                    {'component': 'td', 'text': health.get("last_time") or "-"},
                 ]
             })
-        return [{'component': 'div', 'props': {'class': 'grid gap-3 grid-info-card'}, 'content': contents}]
+        return [{
+            'component': 'VTable',
+            'props': {'hover': True, 'density': 'compact', 'class': 'mb-3'},
+            'content': [
+                {
+                    'component': 'thead',
+                    'content': [{
+                        'component': 'tr',
+                        'content': [{'component': 'th', 'text': text}
+                                    for text in ['站点', '状态', '平均耗时', '超时', '连续失败', '最近错误', '最近请求']]
+                    }]
+                },
+                {'component': 'tbody', 'content': rows}
+            ]
+        }]
+
+    def __get_job_page(self) -> List[dict]:
+        """
+        拼装后台处理任务提示，提供刷新按钮轮询任务状态
+        """
+        active_jobs = [job for job in self._jobs.values() if job.get("status") in ("queued", "running")]
+        failed_jobs = [job for job in self._jobs.values() if job.get("status") == "failed" and not job.get("seen")]
+        if not active_jobs and not failed_jobs:
+            return []
+        for job in failed_jobs:
+            job["seen"] = True
+        lines = [f"{job.get('title')}：{'处理中' if job.get('status') == 'running' else '排队中'}" for job in active_jobs]
+        lines += [f"{job.get('title')}：处理失败 {job.get('message') or ''}" for job in failed_jobs]
+        return [{
+            'component': 'VAlert',
+            'props': {'type': 'error' if failed_jobs else 'info', 'variant': 'tonal', 'class': 'mb-3'},
+            'content': [
+                {'component': 'div', 'text': f"后台处理中 {len(active_jobs)} 项" + (f"，失败 {len(failed_jobs)} 项" if failed_jobs else "")},
+                *[{'component': 'div', 'props': {'class': 'text-caption'}, 'text': line} for line in lines],
+                {
+                    'component': 'VBtn',
+                    'props': {'size': 'small', 'variant': 'tonal', 'class': 'mt-2'},
+                    'text': '刷新状态',
+                    'events': {
+                        'click': {
+                            'api': 'plugin/SiteSubscriber/job_status', 'method': 'get',
+                            'params': {'apikey': settings.API_TOKEN},
+                            'refresh': True
+                        }
+                    }
+                }
+            ]
+        }]
 
     def __send_independent_notification(self, title: str, text: str, image: Optional[str] = None,
                                         poster: Optional[str] = None, overview: Optional[str] = None,
                                         links: Optional[List[Dict[str, str]]] = None) -> bool:
         """
-        使用独立通知设置发送通知。返回是否已成功发送。
-        仅当开启了独立通知且配置有效时生效；当前仅支持 Telegram。
+        使用独立通知设置发送通知。返回是否至少有一个通道发送成功。
+        仅当开启了独立通知且配置有效时生效；支持 telegram、webhook、bark 通道，各通道并发发送。
         """
         try:
             if not self._independent_notify:
@@ -583,54 +1089,126 @@ class SiteSubscriber(_PluginBase):
             # 拼装通知正文：当前仅包含标题与文本，避免平台差异带来的失败
             message_lines = [title, text]
             message = "\n".join([line for line in message_lines if line])
+            photo_url = image or poster
 
-            any_sent = False
+            requests_list = []
             for conf in notify_confs:
-                channel = (conf or {}).get("channel")
+                channel = str((conf or {}).get("channel") or "").lower()
                 if not channel:
                     continue
-                if channel.lower() == "telegram":
-                    token = conf.get("token")
-                    chat_id = conf.get("chat_id")
-                    use_proxy = conf.get("proxy")
-                    if not token or not chat_id:
-                        logger.warning("独立通知 Telegram 配置缺少 token 或 chat_id，已跳过")
-                        continue
-                    # 根据全局代理设置可选地构造 requests 代理
-                    proxies = None
-                    if use_proxy and getattr(settings, "PROXY", None):
-                        proxy_value = settings.PROXY
-                        if isinstance(proxy_value, str):
-                            proxies = {"http": proxy_value, "https": proxy_value}
-                        elif isinstance(proxy_value, dict):
-                            proxies = proxy_value
-                    photo_url = image or poster
-                    try:
-                        if photo_url:
-                            url = f"https://api.telegram.org/bot{token}/sendPhoto"
-                            payload = {"chat_id": chat_id, "photo": photo_url, "caption": message}
-                            resp = requests.post(url, data=payload, timeout=10, proxies=proxies)
-                        else:
-                            url = f"https://api.telegram.org/bot{token}/sendMessage"
-                            payload = {"chat_id": chat_id, "text": message}
-                            resp = requests.post(url, data=payload, timeout=10, proxies=proxies)
-                        if resp.ok:
-                            any_sent = True
-                        else:
-                            logger.error(f"Telegram 发送失败：{resp.status_code} {resp.text}")
-                    except Exception as send_err:
-                        logger.error(f"Telegram 发送异常：{send_err}")
-                else:
-                    logger.warning(f"不支持的独立通知通道：{channel}")
+                request = self.__build_notify_request(channel=channel, conf=conf, title=title, text=text,
+                                                      message=message, photo_url=photo_url)
+                if request:
+                    requests_list.append((channel, request))
+            if not requests_list:
+                return False
 
-            return any_sent
+            if not self._notify_executor:
+                self._notify_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="SiteSubscriber-notify")
+            futures = [self._notify_executor.submit(self.__post_notify, channel, request)
+                       for channel, request in requests_list]
+            # 整体等待时间取各通道超时的最大值，而不是累加
+            max_timeout = max(request.get("timeout") for _, request in requests_list)
+            done, not_done = wait(futures, timeout=max_timeout + 5)
+            for future in not_done:
+                future.cancel()
+            return any(future.result() for future in done)
         except Exception as e:
             logger.error(f"独立通知发送失败：{e}")
             return False
 
-    def stop_service(self):
+    def __build_notify_request(self, channel: str, conf: dict, title: str, text: str,
+                               message: str, photo_url: Optional[str]) -> Optional[dict]:
         """
-        退出插件
+        将单个通道配置转换为 HTTP 请求参数：{method, url, data/json, headers, timeout, proxies}
+        """
+        try:
+            timeout = float(conf.get("timeout") or self._notify_timeout)
+        except (TypeError, ValueError):
+            timeout = self._notify_timeout
+        # 根据全局代理设置可选地构造 requests 代理
+        proxies = None
+        if conf.get("proxy") and getattr(settings, "PROXY", None):
+            proxy_value = settings.PROXY
+            if isinstance(proxy_value, str):
+                proxies = {"http": proxy_value, "https": proxy_value}
+            elif isinstance(proxy_value, dict):
+                proxies = proxy_value
+        request = {"method": "POST", "timeout": timeout, "proxies": proxies}
+
+        if channel == "telegram":
+            token = conf.get("token")
+            chat_id = conf.get("chat_id")
+            if not token or not chat_id:
+                logger.warning("独立通知 Telegram 配置缺少 token 或 chat_id，已跳过")
+                return None
+            # 优先发送图片，否则发送文本
+            if photo_url:
+                request["url"] = f"https://api.telegram.org/bot{token}/sendPhoto"
+                request["data"] = {"chat_id": chat_id, "photo": photo_url, "caption": message}
+            else:
+                request["url"] = f"https://api.telegram.org/bot{token}/sendMessage"
+                request["data"] = {"chat_id": chat_id, "text": message}
+        elif channel == "webhook":
+            url = conf.get("url")
+            if not url:
+                logger.warning("独立通知 webhook 配置缺少 url，已跳过")
+                return None
+            request["method"] = str(conf.get("method") or "POST").upper()
+            request["url"] = url
+            request["headers"] = conf.get("headers") or None
+            payload = {"title": title, "text": text, "image": photo_url}
+            if request["method"] == "GET":
+                request["params"] = {k: v for k, v in payload.items() if v}
+            else:
+                request["json"] = payload
+        elif channel == "bark":
+            key = conf.get("key")
+            if not key:
+                logger.warning("独立通知 Bark 配置缺少 key，已跳过")
+                return None
+            server = str(conf.get("server") or "https://api.day.app").rstrip("/")
+            request["url"] = f"{server}/push"
+            request["json"] = {"device_key": key, "title": title, "body": text}
+            if photo_url:
+                request["json"]["icon"] = photo_url
+            if conf.get("group"):
+                request["json"]["group"] = conf.get("group")
+        else:
+            logger.warning(f"不支持的独立通知通道：{channel}")
+            return None
+        return request
+
+    def __post_notify(self, channel: str, request: dict) -> bool:
+        """
+        发送单个通道的通知，复用共享会话的连接池
+        """
+        try:
+            resp = self.__get_notify_session().request(**request)
+            if resp.ok:
+                return True
+            logger.error(f"独立通知 {channel} 发送失败：{resp.status_code} {resp.text}")
+        except Exception as send_err:
+            logger.error(f"独立通知 {channel} 发送异常：{send_err}")
+        return False
+
+    def __get_notify_session(self):
+        """
+        独立通知共享会话：首次使用时创建，各通道复用 TCP/TLS 连接
+        """
+        if not self._notify_session:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._notify_session = session
+        return self._notify_session
+
+    def __stop_scheduler(self):
+        """
+        停止立即运行一次的定时器
         """
         try:
             if self._scheduler:
@@ -638,22 +1216,247 @@ class SiteSubscriber(_PluginBase):
                 if self._scheduler.running:
                     self._scheduler.shutdown()
                 self._scheduler = None
+        except Exception as e:
+            logger.error("停止定时任务失败：%s" % str(e))
+
+    def stop_service(self):
+        """
+        退出插件
+        """
+        self.__stop_scheduler()
+        try:
+            if self._job_executor:
+                # 未开始的任务直接丢弃，对应待办项仍为 pending，可重新确认
+                self._job_executor.shutdown(wait=False, cancel_futures=True)
+                self._job_executor = None
+                self._jobs = {}
+            if self._image_executor:
+                self._image_executor.shutdown(wait=False, cancel_futures=True)
+                self._image_executor = None
+                with self._image_lock:
+                    self._image_tasks = 0
+            if self._search_executor:
+                self._search_executor.shutdown(wait=False, cancel_futures=True)
+                self._search_executor = None
+                self._site_searches.clear()
+            if self._notify_executor:
+                self._notify_executor.shutdown(wait=False, cancel_futures=True)
+                self._notify_executor = None
+            if self._notify_session:
+                self._notify_session.close()
+                self._notify_session = None
         except Exception as e:
             logger.error("退出插件失败：%s" % str(e))
 
     def confirm_item(self, key: str, apikey: str):
         """
-        确认待办事项
+        确认待办事项：加入后台处理队列后立即返回任务ID
         """
         if apikey != settings.API_TOKEN:
             return schemas.Response(success=False, message="API密钥错误")
-        
+
         # 使用历史唯一键精确定位待办项
         item_to_process = self._history.get(key)
         if not item_to_process or item_to_process.get("status") != "pending":
             logger.error(f"确认失败：未在历史记录中找到待办事项 - key: {key}")
             return schemas.Response(success=False, message="未找到指定的待办事项")
 
+        job = self.__submit_job(job_type="confirm", key=key, func=self.__execute_confirm)
+        return schemas.Response(success=True, message="已加入处理队列", data={"job_id": job.get("id")})
+
+    def ignore_item(self, key: str, apikey: str):
+        """
+        忽略待办事项：加入后台处理队列后立即返回任务ID
+        """
+        if apikey != settings.API_TOKEN:
+            return schemas.Response(success=False, message="API密钥错误")
+
+        # 使用历史唯一键精确定位待办项
+        item_to_ignore = self._history.get(key)
+        if not item_to_ignore or item_to_ignore.get("status") != "pending":
+            return schemas.Response(success=False, message="未找到指定的待办事项")
+
+        job = self.__submit_job(job_type="ignore", key=key, func=self.__execute_ignore)
+        return schemas.Response(success=True, message="已加入处理队列", data={"job_id": job.get("id")})
+
+    def confirm_items(self, apikey: str, keys: str = None, site: str = None, item_type: str = None,
+                      older_than: int = None):
+        """
+        批量确认待办事项：按键列表（逗号分隔）或过滤条件（站点、类型、早于N天）选择
+        """
+        if apikey != settings.API_TOKEN:
+            return schemas.Response(success=False, message="API密钥错误")
+        selected = self.__select_pending_keys(keys=keys, site=site, mtype=item_type, older_than=older_than)
+        if not selected:
+            return schemas.Response(success=False, message="没有符合条件的待办事项")
+        job = self.__submit_job(job_type="confirm", key=None, func=self.__execute_confirm_batch, keys=selected)
+        if not job:
+            return schemas.Response(success=False, message="所选待办事项均已在处理中")
+        return schemas.Response(success=True, message=f"已将 {len(job.get('keys'))} 项加入处理队列",
+                                data={"job_id": job.get("id")})
+
+    def ignore_items(self, apikey: str, keys: str = None, site: str = None, item_type: str = None,
+                     older_than: int = None):
+        """
+        批量忽略待办事项：按键列表（逗号分隔）或过滤条件（站点、类型、早于N天）选择
+        """
+        if apikey != settings.API_TOKEN:
+            return schemas.Response(success=False, message="API密钥错误")
+        selected = self.__select_pending_keys(keys=keys, site=site, mtype=item_type, older_than=older_than)
+        if not selected:
+            return schemas.Response(success=False, message="没有符合条件的待办事项")
+        job = self.__submit_job(job_type="ignore", key=None, func=self.__execute_ignore_batch, keys=selected)
+        if not job:
+            return schemas.Response(success=False, message="所选待办事项均已在处理中")
+        return schemas.Response(success=True, message=f"已将 {len(job.get('keys'))} 项加入处理队列",
+                                data={"job_id": job.get("id")})
+
+    def __select_pending_keys(self, keys: Optional[str] = None, site: Optional[str] = None,
+                              mtype: Optional[str] = None, older_than: Optional[int] = None) -> List[str]:
+        """
+        按条件筛选待办项键，已在后台处理中的待办项不重复选择
+        """
+        key_set = {key.strip() for key in keys.split(",") if key.strip()} if keys else None
+        deadline = None
+        if older_than:
+            deadline = (datetime.datetime.now() - datetime.timedelta(days=int(older_than))).strftime("%Y-%m-%d %H:%M:%S")
+        active_keys = self.__get_active_job_keys()
+        selected = []
+        for key, item in list(self._history.items()):
+            if item.get("status") != "pending" or key in active_keys:
+                continue
+            if key_set is not None and key not in key_set:
+                continue
+            if site and str(item.get("site_id")) != str(site):
+                continue
+            if mtype and item.get("type") != mtype:
+                continue
+            if deadline and (item.get("time") or "") >= deadline:
+                continue
+            selected.append(key)
+        return selected
+
+    def job_status(self, apikey: str, job_id: str = None):
+        """
+        查询后台任务状态：指定 job_id 返回单个任务，否则返回全部未结束及最近的任务
+        """
+        if apikey != settings.API_TOKEN:
+            return schemas.Response(success=False, message="API密钥错误")
+        if job_id:
+            job = self._jobs.get(job_id)
+            if not job:
+                return schemas.Response(success=False, message="未找到指定的任务")
+            return schemas.Response(success=True, data=job)
+        return schemas.Response(success=True, data={"jobs": list(self._jobs.values())})
+
+    def __submit_job(self, job_type: str, key: Optional[str], func, keys: Optional[List[str]] = None) -> Optional[dict]:
+        """
+        提交后台任务；待办项已在其他未结束的任务（单项或批量）中时不重复提交：
+        单项任务返回已有的任务，批量任务剔除这些待办项，全部已在处理中时返回 None
+        :param key: 单个待办项键，批量任务为空
+        :param keys: 批量任务包含的待办项键
+        """
+        with self._history_lock:
+            active_jobs = [job for job in self._jobs.values() if job.get("status") in ("queued", "running")]
+            if key:
+                for job in active_jobs:
+                    if job.get("key") == key or key in (job.get("keys") or []):
+                        return job
+                item = self._history.get(key) or {}
+                title = self._get_log_title(item.get("mediainfo", {}), item.get("meta", {}))
+            else:
+                keys = [k for k in (keys or []) if k not in self.__get_active_job_keys()]
+                if not keys:
+                    return None
+                title = f"批量{'确认' if job_type == 'confirm' else '忽略'} {len(keys)} 项"
+            job = {
+                "id": uuid.uuid4().hex,
+                "type": job_type,
+                "key": key,
+                "keys": keys or [],
+                "title": title,
+                "status": "queued",
+                "message": None,
+                "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            self._jobs[job["id"]] = job
+            # 仅保留最近 200 个任务记录
+            if len(self._jobs) > 200:
+                for job_id in list(self._jobs.keys())[:len(self._jobs) - 200]:
+                    if self._jobs[job_id].get("status") not in ("queued", "running"):
+                        self._jobs.pop(job_id, None)
+            if not self._job_executor:
+                self._job_executor = ThreadPoolExecutor(max_workers=max(1, self._confirm_workers),
+                                                        thread_name_prefix="SiteSubscriber-job")
+        self._job_executor.submit(self.__run_job, job, func)
+        logger.info(f"'{job.get('title')}' 已加入后台处理队列：{job_type}，任务ID：{job.get('id')}")
+        return job
+
+    @staticmethod
+    def __run_job(job: dict, func):
+        """
+        执行后台任务并记录结果
+        """
+        job["status"] = "running"
+        try:
+            success, message = func(job.get("key") or job.get("keys"))
+            job["status"] = "success" if success else "failed"
+            job["message"] = message
+        except Exception as e:
+            logger.error(f"后台任务执行出错：{str(e)} - {traceback.format_exc()}")
+            job["status"] = "failed"
+            job["message"] = str(e)
+        job["finish_time"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def __get_active_job_keys(self) -> set:
+        """
+        获取仍在排队或处理中的待办项键
+        """
+        keys = set()
+        for job in list(self._jobs.values()):
+            if job.get("status") in ("queued", "running"):
+                keys.add(job.get("key"))
+                keys.update(job.get("keys") or [])
+        return keys
+
+    def __execute_confirm(self, key: str) -> Tuple[bool, str]:
+        """
+        执行确认：下载或添加订阅，并将状态更新为 confirmed
+        """
+        success, message = self.__apply_confirm(key)
+        if success:
+            self.__save_history()
+            logger.info("状态更新并保存成功")
+        return success, message
+
+    def __claim_item(self, key: str) -> Optional[dict]:
+        """
+        认领待办项：在历史锁内确认仍为待确认并标记为处理中，并发的确认/忽略不会重复处理同一项
+        """
+        with self._history_lock:
+            item = self._history.get(key)
+            if not item or item.get("status") != "pending":
+                return None
+            item["status"] = "processing"
+            return item
+
+    def __release_item(self, key: str):
+        """
+        处理失败时释放认领，待办项恢复为待确认，可重新处理
+        """
+        with self._history_lock:
+            item = self._history.get(key)
+            if item and item.get("status") == "processing":
+                item["status"] = "pending"
+
+    def __apply_confirm(self, key: str) -> Tuple[bool, str]:
+        """
+        执行确认动作并更新内存中的状态，不持久化
+        """
+        item_to_process = self.__claim_item(key)
+        if not item_to_process:
+            return False, "未找到指定的待办事项或已在处理中"
+
         logger.info(f"开始确认项目：{item_to_process.get('title')}")
 
         try:
@@ -685,48 +1488,244 @@ class SiteSubscriber(_PluginBase):
 
             logger.info(f"动作：{self._get_action_cn(action)}，站点ID：{site_id}")
 
+            profile = self.__get_profile(item_to_process.get("profile"))
+            if not profile:
+                # 方案已被改名或删除：不能改用默认方案的下载器、保存路径与过滤条件，保留待办
+                message = f"方案 {item_to_process.get('profile')} 已不存在，无法处理该待办事项"
+                logger.error(f"'{self._get_log_title(item_to_process.get('mediainfo', {}), item_to_process.get('meta', {}))}' {message}")
+                self.__release_item(key)
+                return False, message
             if action == "download":
                 logger.info("执行下载...")
-                self.download_torrent(meta=meta, mediainfo=mediainfo, torrent_info=torrent_info)
+                self.download_torrent(meta=meta, mediainfo=mediainfo, torrent_info=torrent_info, profile=profile)
             elif action == "manual_subscribe":
                 logger.info("执行手动订阅...")
                 if self.subscribechain.exists(mediainfo=mediainfo, meta=meta):
                     logger.info(f"'{mediainfo.title_year} {meta.season}' 已在订阅中")
                 else:
-                    self.add_subscribe(meta=meta, mediainfo=mediainfo, site_id=site_id)
-            
-            logger.info("操作执行完毕，更新状态...")
-            # 更新状态为 confirmed 并持久化
-            self._history[key]["status"] = "confirmed"
-            self.save_data('history', self._history)
-            logger.info("状态更新并保存成功")
+                    self.add_subscribe(meta=meta, mediainfo=mediainfo, site_id=site_id, profile=profile)
 
-            return schemas.Response(success=True, message="操作成功")
+            logger.info("操作执行完毕，更新状态...")
+            # 更新状态为 confirmed，由调用方持久化
+            with self._history_lock:
+                self._history[key]["status"] = "confirmed"
+            self.__remove_item_images(key)
+            return True, "操作成功"
         except Exception as e:
             logger.error(f"处理待办事项出错：{str(e)} - {traceback.format_exc()}")
-            return schemas.Response(success=False, message=f"操作失败：{str(e)}")
+            self.__release_item(key)
+            return False, f"操作失败：{str(e)}"
 
-    def ignore_item(self, key: str, apikey: str):
+    def __execute_ignore(self, key: str) -> Tuple[bool, str]:
         """
-        忽略待办事项
+        执行忽略：将状态更新为 ignored
         """
-        if apikey != settings.API_TOKEN:
+        # 检查与更新在同一把锁内完成，避免与并发的确认任务同时处理同一项
+        with self._history_lock:
+            item_to_ignore = self._history.get(key)
+            if not item_to_ignore or item_to_ignore.get("status") != "pending":
+                return False, "未找到指定的待办事项或已在处理中"
+            item_to_ignore["status"] = "ignored"
+
+        log_title = self._get_log_title(item_to_ignore.get('mediainfo', {}), item_to_ignore.get('meta', {}))
+        logger.info(f"正在忽略项目：{log_title}")
+        self.__remove_item_images(key)
+        self.__save_history()
+        logger.info(f"'{log_title}' 已被忽略")
+        return True, "忽略成功"
+
+    def __execute_confirm_batch(self, keys: List[str]) -> Tuple[bool, str]:
+        """
+        批量确认：逐项执行动作，最后统一保存一次历史
+        """
+        succeeded, failed = 0, 0
+        for key in keys:
+            success, _ = self.__apply_confirm(key)
+            if success:
+                succeeded += 1
+            else:
+                failed += 1
+        if succeeded:
+            self.__save_history()
+        message = f"批量确认完成：成功 {succeeded} 项，失败 {failed} 项"
+        logger.info(message)
+        return failed == 0, message
+
+    def __execute_ignore_batch(self, keys: List[str]) -> Tuple[bool, str]:
+        """
+        批量忽略：一次性更新状态并保存一次历史
+        """
+        count = 0
+        with self._history_lock:
+            for key in keys:
+                item = self._history.get(key)
+                if item and item.get("status") == "pending":
+                    item["status"] = "ignored"
+                    self.__remove_item_images(key)
+                    count += 1
+        if count:
+            self.__save_history()
+        message = f"批量忽略完成：共 {count} 项"
+        logger.info(message)
+        return True, message
+
+    def __next_history_version(self) -> int:
+        """
+        生成新的历史版本号
+        """
+        with self._history_lock:
+            self._history_version += 1
+            return self._history_version
+
+    def __save_history(self):
+        """
+        持久化历史记录；加锁后保存快照，避免与后台任务并发修改冲突
+        """
+        with self._image_lock:
+            self._image_dirty = False
+        with self._history_lock:
+            # “下载中”仅是本轮批次在内存中的去重标记，不落盘：运行中断时不会遗留永远“下载中”的记录；
+            # “处理中”按待确认保存，后台任务被中断时待办项仍可重新处理
+            self.save_data('history', {key: {**item, "status": "pending"} if item.get("status") == "processing" else item
+                                       for key, item in self._history.items()
+                                       if item.get("status") != "downloading"})
+
+    def get_image(self, key: str, kind: str, sig: str = None, apikey: str = None):
+        """
+        返回待办项的本地缓存图片；未缓存时重定向到原始地址。
+        页面中的 <img> 无法携带认证头，使用按图片生成的签名 sig 校验，不在地址中暴露 API 密钥
+        """
+        if apikey != settings.API_TOKEN and not (sig and hmac.compare_digest(sig, self.__get_image_sig(key, kind))):
             return schemas.Response(success=False, message="API密钥错误")
+        image_path = self.__get_image_path(key, kind)
+        if image_path and image_path.exists():
+            return Response(content=image_path.read_bytes(), media_type="image/jpeg",
+                            headers={"Cache-Control": "private, max-age=604800"})
+        item = self._history.get(key) or {}
+        remote_url = self.__get_remote_image_url(item, kind)
+        if remote_url:
+            return RedirectResponse(url=remote_url)
+        return schemas.Response(success=False, message="未找到图片")
+
+    def __get_image_dir(self) -> Path:
+        """
+        本地图片缓存目录
+        """
+        return self.get_data_path() / "images"
 
-        # 使用历史唯一键精确定位待办项
-        item_to_ignore = self._history.get(key)
-        if not item_to_ignore or item_to_ignore.get("status") != "pending":
-            return schemas.Response(success=False, message="未找到指定的待办事项")
+    def __get_image_path(self, key: Optional[str], kind: str) -> Optional[Path]:
+        """
+        本地缓存图片路径
+        """
+        if not key or kind not in self._image_widths:
+            return None
+        # 文件名使用键的哈希，避免不同键替换特殊字符后落到同一文件
+        key_hash = hashlib.sha1(str(key).encode("utf-8")).hexdigest()
+        return self.__get_image_dir() / f"{key_hash}_{kind}.jpg"
 
-        mediainfo_dict = item_to_ignore.get('mediainfo', {})
-        meta_dict = item_to_ignore.get('meta', {})
-        log_title = self._get_log_title(mediainfo_dict, meta_dict)
-        logger.info(f"正在忽略项目：{log_title}")
-        self._history[key]["status"] = "ignored"
-        self.save_data('history', self._history)
-        logger.info(f"'{log_title}' 已被忽略")
+    @staticmethod
+    def __get_remote_image_url(item: dict, kind: str) -> Optional[str]:
+        """
+        待办项的原始图片地址
+        """
+        if kind == "poster":
+            return item.get("poster")
+        return (item.get("mediainfo") or {}).get("backdrop_path")
+
+    def __get_image_url(self, item: dict, kind: str) -> Optional[str]:
+        """
+        卡片使用的图片地址：已缓存时走插件接口，否则使用原始地址
+        """
+        if kind in (item.get("cached_images") or []):
+            params = {"key": item.get("key"), "kind": kind, "sig": self.__get_image_sig(item.get("key"), kind)}
+            return f"/api/v1/plugin/SiteSubscriber/image?{urlencode(params)}"
+        return self.__get_remote_image_url(item, kind)
 
-        return schemas.Response(success=True, message="忽略成功")
+    @staticmethod
+    def __get_image_sig(key: Optional[str], kind: Optional[str]) -> str:
+        """
+        图片地址签名：以 API 密钥为密钥对 (键, 类型) 做 HMAC，只能用于读取对应的那一张图片
+        """
+        message = f"{key}|{kind}".encode("utf-8")
+        return hmac.new(str(settings.API_TOKEN).encode("utf-8"), message, hashlib.sha256).hexdigest()[:32]
+
+    def __prefetch_item_images(self, key: str):
+        """
+        在后台下载并缩小待办项的海报与背景图
+        """
+        if not self._image_executor:
+            self._image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="SiteSubscriber-image")
+        with self._image_lock:
+            self._image_tasks += 1
+        self._image_executor.submit(self.__run_image_task, key)
+
+    def __run_image_task(self, key: str):
+        """
+        执行单个图片缓存任务，只更新内存中的待办项：运行期间的更新由本轮结束时的保存一并落盘，
+        运行结束后仍在进行的任务由最后一个结束的任务统一保存一次历史
+        """
+        updated = False
+        try:
+            updated = self.__cache_item_images(key)
+        finally:
+            with self._image_lock:
+                self._image_tasks = max(0, self._image_tasks - 1)
+                self._image_dirty = self._image_dirty or updated
+                flush = self._image_dirty and not self._image_tasks and not self._check_lock.locked()
+                if flush:
+                    self._image_dirty = False
+            if flush:
+                self.__save_history()
+
+    def __cache_item_images(self, key: str) -> bool:
+        """
+        下载图片、按宽度等比缩小后保存为 JPEG，并刷新待办项版本以更新卡片；不持久化，返回是否有更新
+        """
+        item = self._history.get(key)
+        if not item or item.get("status") != "pending":
+            return False
+        from PIL import Image
+        cached = []
+        for kind, width in self._image_widths.items():
+            url = self.__get_remote_image_url(item, kind)
+            image_path = self.__get_image_path(key, kind)
+            if not url or not image_path:
+                continue
+            try:
+                res = RequestUtils(proxies=settings.PROXY, timeout=15).get_res(url)
+                if not res or not res.content:
+                    logger.debug(f"下载图片失败：{url}")
+                    continue
+                image = Image.open(io.BytesIO(res.content)).convert("RGB")
+                if image.width > width:
+                    image = image.resize((width, int(image.height * width / image.width)), Image.LANCZOS)
+                image_path.parent.mkdir(parents=True, exist_ok=True)
+                image.save(image_path, format="JPEG", quality=80, optimize=True)
+                cached.append(kind)
+            except Exception as e:
+                logger.debug(f"缓存图片失败：{url} - {str(e)}")
+        if not cached:
+            return False
+        with self._history_lock:
+            item = self._history.get(key)
+            if not item or item.get("status") != "pending":
+                self.__remove_item_images(key)
+                return False
+            item["cached_images"] = cached
+            item["version"] = self.__next_history_version()
+        return True
+
+    def __remove_item_images(self, key: str):
+        """
+        删除待办项的本地缓存图片
+        """
+        for kind in self._image_widths.keys():
+            image_path = self.__get_image_path(key, kind)
+            if image_path and image_path.exists():
+                image_path.unlink(missing_ok=True)
+        item = self._history.get(key)
+        if item:
+            item.pop("cached_images", None)
 
     def __update_config(self):
         """
@@ -737,73 +1736,442 @@ class SiteSubscriber(_PluginBase):
             "cron": self._cron, "address": self._address, "include": self._include,
             "exclude": self._exclude, "clear": self._clear,
             "action": self._action, "save_path": self._save_path,
-            "size_range": self._size_range, "quality": self._quality, "resolution": self._resolution,
+            "size_range": self._size_range, "run_budget": self._run_budget,
+            "breaker_threshold": self._breaker_threshold, "breaker_cooldown": self._breaker_cooldown,
+            "confirm_workers": self._confirm_workers,
+            "source_mode": self._source_mode, "cache_max_age": self._cache_max_age,
+            "download_concurrency": self._download_concurrency, "site_concurrency": self._site_concurrency,
+            "quality": self._quality, "resolution": self._resolution,
             "effect": self._effect, "filter_groups": self._filter_groups, "downloader": self._downloader,
+            "profiles": self._profiles,
+            "profiler_enabled": self._profiler_enabled, "profiler_keep": self._profiler_keep,
+            "log_mode": self._log_mode, "pending_refresh_interval": self._pending_refresh_interval,
             "independent_notify": self._independent_notify,
             "independent_notify_config": self._independent_notify_config
         })
 
     def check(self):
         """
-        通过站点获取数据并处理
+        通过站点获取数据并处理；同一时间只允许一个运行实例，重叠触发直接合并
+        """
+        if not self._check_lock.acquire(blocking=False):
+            logger.info("站点资源订阅任务正在运行中，本次触发已合并跳过")
+            return
+        try:
+            if self._profiler_enabled:
+                self.__check_with_profiler()
+            else:
+                self.__check()
+        finally:
+            self._check_lock.release()
+
+    def __check_with_profiler(self):
+        """
+        使用 cProfile 记录一轮运行，在插件数据目录 profiler/ 下保存原始数据（.prof）与热点函数汇总（.txt）
+        """
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Python 3.12 起同一进程同时只能有一个分析器，其它工具正在分析时本轮不记录
+            logger.warning(f"无法启动性能分析，本轮不记录：{str(e)}")
+            self.__check()
+            return
+        started = time.time()
+        try:
+            self.__check()
+        finally:
+            profiler.disable()
+            try:
+                self.__save_profile(profiler=profiler, elapsed=time.time() - started)
+            except Exception as e:
+                logger.error(f"保存性能分析结果失败：{str(e)}")
+
+    @staticmethod
+    def __get_profile_scope() -> str:
         """
-        # 每轮运行重置日志分组键
+        性能分析的统计范围：Python 3.12 起 cProfile 基于 sys.monitoring，对整个进程生效；此前只记录调用线程
+        """
+        if sys.version_info >= (3, 12):
+            return ("整个进程的全部线程（Python 3.12 起 cProfile 为进程级）：除本插件的 check 与工作线程外，"
+                    "同一时段内 MoviePilot 其它服务与插件的调用也计入，阅读热点时请注意所属模块")
+        return "仅 check 所在线程；下载、图片、通知、搜索等工作线程中的调用不计入"
+
+    def __save_profile(self, profiler: cProfile.Profile, elapsed: float, top: int = 30):
+        """
+        保存性能分析结果并轮转，仅保留最近 profiler_keep 份
+        """
+        profile_dir = self.get_data_path() / "profiler"
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        name = f"check_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        scope = self.__get_profile_scope()
+
+        summary = io.StringIO()
+        summary.write(f"运行耗时：{elapsed:.2f} 秒\n")
+        summary.write(f"统计范围：{scope}\n\n")
+        stats = pstats.Stats(profiler, stream=summary)
+        stats.dump_stats(str(profile_dir / f"{name}.prof"))
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+        (profile_dir / f"{name}.txt").write_text(summary.getvalue(), encoding="utf-8")
+        logger.info(f"性能分析结果已保存：{profile_dir / name}.prof，耗时 {elapsed:.2f} 秒，统计范围：{scope}")
+
+        for suffix in ("*.prof", "*.txt"):
+            for old_file in sorted(profile_dir.glob(suffix), reverse=True)[max(1, self._profiler_keep):]:
+                old_file.unlink(missing_ok=True)
+
+    def __check(self):
+        """
+        按站点顺序处理数据，超出运行时间预算时记录中断的站点，下次从该站点继续；
+        站点内不记录位置（列表每次重新获取，位置会随新种子偏移），已处理的种子由已处理索引跳过
+        """
+        # 每轮运行重置日志分组键与处理结果计数
         self._last_log_group_key = None
-        logger.info(f"站点资源订阅 check 任务开始执行，站点: {self._address}，动作: {self._get_action_cn(self._action)}")
+        self._run_stats = Counter()
+        run_started = time.time()
+        profiles = self.__get_profiles()
+        profile_desc = ", ".join(f"{self._get_profile_label(p)}:{self._get_action_cn(p.get('action'))}" for p in profiles)
+        logger.info(f"站点资源订阅 check 任务开始执行，站点: {self._address}，方案: {profile_desc}")
         if not self._address:
             logger.warning("站点列表为空，任务结束。")
             return
 
-        # 若设置了清理开关，先清空历史并重置标志位
+        # 若设置了清理开关，先清空历史与游标并重置标志位
         if self._clearflag:
             self._history = {}
-            self.save_data('history', self._history)
-        
-        # 仅保留有效的过滤项（空或“全部”不参与）
-        filter_params = {
-            key: value for key, value in {
-                "include": self._include, "exclude": self._exclude, "quality": self._quality,
-                "resolution": self._resolution, "effect": self._effect,
-            }.items() if value and value != '全部'
-        }
-        logger.info(f"将使用以下参数进行过滤: {filter_params}")
-        logger.info(f"将使用以下优先级规则组进行过滤: {self._filter_groups}")
+            self.__save_history()
+            shutil.rmtree(self.__get_image_dir(), ignore_errors=True)
+            self.save_data('cursor', {})
+            self._seen_index = {}
+
+        for profile in profiles:
+            logger.info(f"方案 {self._get_profile_label(profile)} 将使用以下参数进行过滤: "
+                        f"包含={profile.get('include') or '-'}，排除={profile.get('exclude') or '-'}，"
+                        f"大小={profile.get('size_range') or '-'}，属性={profile.get('filter_params')}，"
+                        f"优先级规则组: {profile.get('filter_groups')}")
+        self.__load_seen_index(profiles)
 
         torrent_helper = TorrentHelper()
-
-        for site_id in self._address:
-            if not site_id:
-                continue
+        self._download_batch = []
+        # 本轮识别结果缓存：同一种子（跨站点、跨方案）只识别一次
+        recognized: Dict[str, Tuple[Optional[MetaInfo], Optional[MediaInfo]]] = {}
+
+        # 读取上次未完成的游标，从中断的站点继续，其余站点按原顺序轮转
+        site_ids = [site_id for site_id in self._address if site_id]
+        cursor = self.get_data('cursor') or {}
+        cursor_site = cursor.get("site")
+        if cursor_site in site_ids:
+            start = site_ids.index(cursor_site)
+            site_ids = site_ids[start:] + site_ids[:start]
+            logger.info(f"从上次中断处继续：站点 {cursor_site}")
+        deadline = time.monotonic() + self._run_budget * 60 if self._run_budget else None
+
+        # 缓存模式下一次性读取系统站点种子缓存，按站点分组
+        cached_contexts = self.__load_cached_contexts() if self._source_mode == "cache" else {}
+
+        for site_id in site_ids:
             logger.info(f"开始处理站点：{site_id} ...")
+            self._site_stats = Counter()
 
-            contexts = self.searchchain.search_by_title(title="", sites=[site_id])
+            contexts = self.__get_site_contexts(site_id, cached_contexts)
             if not contexts:
-                logger.error(f"未从站点 {site_id} 获取到数据")
+                self._run_stats["站点无数据"] += 1
                 continue
 
-            for context in contexts:
+            # 批量预过滤：大小、包含/排除与已处理索引对整站数据一次性判断，只有幸存项进入逐条处理；
+            # 上次中断前已处理的种子已写入已处理索引，在此一并跳过
+            candidates = self.__prefilter(contexts=contexts, profiles=profiles)
+            self._site_stats["预过滤跳过"] += max(0, len(contexts) - len(candidates))
+            for index, context, context_profiles, fingerprint in candidates:
+                if deadline and time.monotonic() > deadline:
+                    self.save_data('cursor', {"site": site_id})
+                    self.__flush_downloads()
+                    self.__save_history()
+                    self.__save_seen_index()
+                    self._clearflag = False
+                    logger.warning(f"已超出单次运行时长上限 {self._run_budget} 分钟，"
+                                   f"停止于站点 {site_id} 第 {index} 条，下次运行将从该站点继续")
+                    self.__log_site_summary(site_id, len(contexts))
+                    self.__log_run_summary(run_started)
+                    return
                 try:
-                    self._process_torrent(context=context, site_id=site_id,
-                                          filter_params=filter_params, torrent_helper=torrent_helper)
+                    if self._process_torrent(context=context, site_id=site_id, profiles=context_profiles,
+                                             torrent_helper=torrent_helper, recognized=recognized):
+                        self._seen_index[fingerprint] = time.time()
                 except Exception as err:
                     logger.error(f'处理种子信息出错：{str(err)} - {traceback.format_exc()}')
-            
-            logger.info(f"站点 {site_id} 处理完成")
 
-        self.save_data('history', self._history)
+            self.__save_seen_index()
+            self.__log_site_summary(site_id, len(contexts))
+
+        # 全部站点处理完毕，批量提交下载并清除游标
+        self.__flush_downloads()
+        self.__save_seen_index()
+        self.save_data('cursor', {})
+        self.__save_history()
         self._clearflag = False
+        self.__log_run_summary(run_started)
+
+    def __log_decision(self, reason: str, message: str, level: str = "info"):
+        """
+        记录单个种子的处理结果：计入当前站点统计；汇总模式下日志降为 debug
+        """
+        self._site_stats[reason] += 1
+        self.__log_detail(message, level=level)
+
+    def __log_detail(self, message: str, level: str = "info"):
+        """
+        输出逐条处理日志：详细模式按原级别输出，汇总模式降为 debug
+        """
+        if self._log_mode == "summary":
+            logger.debug(message)
+        else:
+            getattr(logger, level)(message)
+
+    def __log_site_summary(self, site_id: str, total: int):
+        """
+        输出单个站点的处理汇总，并累加到本轮统计
+        """
+        self._run_stats.update(self._site_stats)
+        self._run_stats["种子总数"] += total
+        details = "，".join(f"{reason} {count}" for reason, count in self._site_stats.most_common())
+        logger.info(f"站点 {site_id} 处理完成：共 {total} 条" + (f"，{details}" if details else ""))
+
+    def __log_run_summary(self, started: float):
+        """
+        输出本轮运行汇总
+        """
+        total = self._run_stats.pop("种子总数", 0)
+        details = "，".join(f"{reason} {count}" for reason, count in self._run_stats.most_common())
+        logger.info(f"站点资源订阅本轮完成：耗时 {time.time() - started:.1f} 秒，共 {total} 条"
+                    + (f"，{details}" if details else ""))
+
+    def __flush_downloads(self):
+        """
+        批量提交本轮收集的下载：按下载器分组并发提交，每个站点同时获取种子的数量受限，
+        结果逐项写回历史（downloaded / download_failed），最后由调用方统一保存
+        """
+        batch, self._download_batch = self._download_batch, []
+        if not batch:
+            return
+        logger.info(f"开始批量提交下载：共 {len(batch)} 项")
+        site_semaphores: Dict[str, threading.Semaphore] = {}
+        groups: Dict[Optional[str], List[dict]] = {}
+        for entry in batch:
+            site_semaphores.setdefault(str(entry.get("site_id")), threading.Semaphore(max(1, self._site_concurrency)))
+            groups.setdefault(entry.get("profile", {}).get("downloader"), []).append(entry)
+
+        def _submit(entry: dict):
+            with site_semaphores[str(entry.get("site_id"))]:
+                return self.download_torrent(meta=entry.get("meta"), mediainfo=entry.get("mediainfo"),
+                                             torrent_info=entry.get("torrent_info"), profile=entry.get("profile"))
+
+        executors = []
+        futures = []
+        for downloader, entries in groups.items():
+            executor = ThreadPoolExecutor(max_workers=max(1, self._download_concurrency),
+                                          thread_name_prefix="SiteSubscriber-download")
+            executors.append(executor)
+            futures += [(entry, executor.submit(_submit, entry)) for entry in entries]
+
+        succeeded = 0
+        for entry, future in futures:
+            key = entry.get("key")
+            try:
+                download_id = future.result()
+                error = None if download_id else "下载器未返回任务"
+            except Exception as e:
+                download_id, error = None, str(e)
+                logger.error(f"提交下载出错：{str(e)} - {traceback.format_exc()}")
+            log_title = self._get_log_title(entry.get("mediainfo").to_dict(), entry.get("meta"))
+            with self._history_lock:
+                item = self._history.get(key)
+                if item:
+                    item["status"] = "download_failed" if error else "downloaded"
+                    item["download_id"] = download_id
+                    item["message"] = error
+                    item["time"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            if error:
+                # 下载失败的种子移出已处理索引，下次运行重试
+                self._seen_index.pop(self.__get_seen_fingerprint(entry.get("torrent_info")), None)
+                logger.error(f"'{log_title}' 提交下载失败：{error}")
+            else:
+                succeeded += 1
+                logger.info(f"'{log_title}' 已提交下载")
+        for executor in executors:
+            executor.shutdown(wait=False)
+        logger.info(f"批量提交下载完成：成功 {succeeded} 项，失败 {len(batch) - succeeded} 项")
+
+    @staticmethod
+    def __load_cached_contexts() -> Dict[str, List[Context]]:
+        """
+        读取系统订阅/RSS 流程已刷新的站点种子缓存，按站点ID分组
+        """
+        grouped: Dict[str, List[Context]] = {}
+        try:
+            torrents = TorrentsChain().get_torrents() or {}
+        except Exception as e:
+            logger.error(f"读取系统站点种子缓存失败：{str(e)}")
+            return grouped
+        for contexts in torrents.values():
+            for context in contexts or []:
+                torrent_info = context.torrent_info
+                if not torrent_info or torrent_info.site is None:
+                    continue
+                grouped.setdefault(str(torrent_info.site), []).append(context)
+        logger.info(f"已读取系统站点种子缓存：{len(grouped)} 个站点，"
+                    f"共 {sum(len(v) for v in grouped.values())} 条")
+        return grouped
 
-    def _process_torrent(self, context: Context, site_id: str, filter_params: dict, torrent_helper: TorrentHelper):
+    def __get_site_contexts(self, site_id: str, cached_contexts: Dict[str, List[Context]]) -> Optional[List[Context]]:
         """
-        处理单个种子
+        获取站点候选数据：缓存模式下优先使用系统缓存，站点未缓存或缓存过期时回退直接检索
+        """
+        if self._source_mode != "cache":
+            return self.__search_site(site_id)
+        contexts = cached_contexts.get(str(site_id))
+        if not contexts:
+            logger.info(f"站点 {site_id} 不在系统缓存中，回退直接检索")
+            return self.__search_site(site_id)
+
+        # 以最新一条种子判断缓存是否仍在刷新：最新一条长时间不变视为过期，回退检索一次。
+        # 系统缓存新种子追加在末尾、从头部淘汰，因此缓存的最新项在末尾
+        head = self.__get_context_fingerprint(self.__get_newest_context(contexts, fallback_index=-1))
+        record = self._cache_heads.get(str(site_id)) or {}
+        now = time.time()
+        if record.get("head") != head:
+            self._cache_heads[str(site_id)] = {"head": head, "since": now}
+            self.save_data('cache_heads', self._cache_heads)
+            logger.info(f"站点 {site_id} 使用系统缓存数据 {len(contexts)} 条")
+            return contexts
+        if now - (record.get("since") or now) <= self._cache_max_age * 60:
+            logger.info(f"站点 {site_id} 使用系统缓存数据 {len(contexts)} 条")
+            return contexts
+
+        logger.info(f"站点 {site_id} 缓存已超过 {self._cache_max_age} 分钟未更新，回退直接检索")
+        searched = self.__search_site(site_id)
+        # 检索结果的最新一条与缓存最新一条一致说明站点本身无更新，重新计时，避免冷门站点每次都回退检索；
+        # 直接检索的结果按时间倒序，最新项在开头
+        if not searched or self.__get_context_fingerprint(
+                self.__get_newest_context(searched, fallback_index=0)) == head:
+            self._cache_heads[str(site_id)] = {"head": head, "since": now}
+            self.save_data('cache_heads', self._cache_heads)
+        return searched or contexts
+
+    @staticmethod
+    def __get_newest_context(contexts: List[Context], fallback_index: int) -> Context:
+        """
+        取发布时间最新的一条种子；均无发布时间时按来源的排序取 fallback_index 处的一条
+        """
+        dated = [context for context in contexts if context.torrent_info and context.torrent_info.pubdate]
+        if dated:
+            return max(dated, key=lambda context: str(context.torrent_info.pubdate))
+        return contexts[fallback_index]
+
+    @staticmethod
+    def __get_context_fingerprint(context: Context) -> Optional[str]:
+        """
+        种子指纹：优先使用下载链接，其次标题
         """
         torrent_info = context.torrent_info
         if not torrent_info:
-            return
-        # 不同资源之间插入空行分隔（按完整标题分组）
+            return None
+        return torrent_info.enclosure or torrent_info.page_url or torrent_info.title
+
+    def __search_site(self, site_id: str) -> Optional[List[Context]]:
+        """
+        带熔断与自适应超时的站点拉取：
+        - 熔断打开且未到冷却时间时直接跳过该站点
+        - 冷却结束后进入半开状态，本次请求作为探测，成功则恢复，失败则重新熔断
+        - 超时时间由该站点历史耗时的 P95 推算
+        """
+        health = self._site_health.setdefault(str(site_id), {
+            "latencies": [], "failures": 0, "state": "closed", "opened_at": None, "last_error": None
+        })
+        if health.get("state") == "open":
+            remaining = (health.get("opened_at") or 0) + self._breaker_cooldown * 60 - time.time()
+            if remaining > 0:
+                logger.warning(f"站点 {site_id} 处于熔断状态，跳过本次拉取（剩余冷却 {int(remaining // 60) + 1} 分钟）")
+                return None
+            health["state"] = "half_open"
+            logger.info(f"站点 {site_id} 熔断冷却结束，进入半开状态进行探测")
+
+        # 上次超时的拉取仍在进行中：不再重复请求该站点，也不计入失败
+        previous = self._site_searches.get(str(site_id))
+        if previous and not previous.done():
+            logger.warning(f"站点 {site_id} 上次拉取仍未结束，跳过本次拉取")
+            return None
+
+        timeout = self._get_site_timeout(health.get("latencies"))
+        started = time.time()
+        contexts, error = None, None
+        if not self._search_executor:
+            self._search_executor = ThreadPoolExecutor(max_workers=self._search_workers,
+                                                       thread_name_prefix="SiteSubscriber-search")
+        future = self._search_executor.submit(self.searchchain.search_by_title, title="", sites=[site_id])
+        self._site_searches[str(site_id)] = future
+        try:
+            contexts = future.result(timeout=timeout)
+            if not contexts:
+                error = "未获取到数据"
+        except FutureTimeoutError:
+            # 超时从提交时开始计算：请求仍在排队说明线程池被其他站点占满，并非本站点故障，取消后不计入失败
+            if future.cancel():
+                self._site_searches.pop(str(site_id), None)
+                logger.warning(f"站点 {site_id} 拉取请求排队超过 {timeout} 秒（线程池繁忙），本次跳过，不计入失败")
+                return None
+            # 已在进行中的请求无法中断，下次拉取前检查其是否结束
+            error = f"请求超时（{timeout}秒）"
+        except Exception as err:
+            error = str(err)
+        elapsed = round(time.time() - started, 2)
+        health["last_time"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        if error:
+            health["failures"] = int(health.get("failures") or 0) + 1
+            health["last_error"] = error
+            if health.get("state") == "half_open" or health["failures"] >= self._breaker_threshold:
+                health["state"] = "open"
+                health["opened_at"] = time.time()
+                logger.error(f"未从站点 {site_id} 获取到数据：{error}，连续失败 {health['failures']} 次，"
+                             f"熔断 {self._breaker_cooldown} 分钟")
+            else:
+                logger.error(f"未从站点 {site_id} 获取到数据：{error}")
+            contexts = None
+        else:
+            # 仅记录成功请求的耗时，保留最近 20 次
+            health["latencies"] = (list(health.get("latencies") or []) + [elapsed])[-20:]
+            health["failures"] = 0
+            health["state"] = "closed"
+            health["opened_at"] = None
+            health["last_error"] = None
+        self.save_data('site_health', self._site_health)
+        return contexts
+
+    @staticmethod
+    def _get_site_timeout(latencies: Optional[List[float]]) -> int:
+        """
+        按站点历史耗时的 P95 计算超时时间（2 倍余量，限制在 30~300 秒）；样本不足时使用 120 秒
+        """
+        if not latencies or len(latencies) < 3:
+            return 120
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+        return int(min(300, max(30, p95 * 2)))
+
+    def _process_torrent(self, context: Context, site_id: str, profiles: List[dict], torrent_helper: TorrentHelper,
+                         recognized: Optional[Dict[str, Tuple[Optional[MetaInfo], Optional[MediaInfo]]]] = None) -> bool:
+        """
+        处理单个种子：先按各方案做属性过滤，命中任一方案后识别一次媒体信息，再逐个方案执行后续流程
+        :return: 是否已得出确定结论（媒体信息识别失败可能是临时故障，返回 False 以便下次重试）
+        """
+        torrent_info = context.torrent_info
+        if not torrent_info:
+            return True
+        # 不同资源之间插入空行分隔（按完整标题分组），仅详细日志模式
         try:
             current_key = (torrent_info.title or "").strip()
-            if current_key and self._last_log_group_key != current_key:
+            if self._log_mode != "summary" and current_key and self._last_log_group_key != current_key:
                 if self._last_log_group_key is not None:
                     logger.info("")
                 self._last_log_group_key = current_key
@@ -812,12 +2180,125 @@ class SiteSubscriber(_PluginBase):
         except Exception:
             pass
 
-        # 1) 属性过滤（标题、质量、分辨率、特效等）
-        if not torrent_helper.filter_torrent(torrent_info, filter_params):
-            logger.info(f"'{torrent_info.title}' 不符合属性过滤规则，已跳过")
-            return
+        # 1) 属性过滤（标题、质量、分辨率、特效等），按方案分别判断
+        matched_profiles = [profile for profile in profiles
+                            if torrent_helper.filter_torrent(torrent_info, profile.get("filter_params"))]
+        if not matched_profiles:
+            self.__log_decision("属性不符", f"'{torrent_info.title}' 不符合属性过滤规则，已跳过")
+            return True
+
+        # 2) 元信息识别，尽量提取季号；未识别到媒体名则放弃（同一种子本轮只识别一次）
+        recognize_key = f"{torrent_info.title}|{torrent_info.description or ''}"
+        if recognized is not None and recognize_key in recognized:
+            meta, mediainfo = recognized[recognize_key]
+        else:
+            meta, mediainfo = self.__recognize(torrent_info)
+            if recognized is not None:
+                recognized[recognize_key] = (meta, mediainfo)
+        if not meta:
+            return True
+        if not mediainfo:
+            return False
+
+        for profile in matched_profiles:
+            self.__process_profile(profile=profile, site_id=site_id, meta=meta, mediainfo=mediainfo,
+                                   torrent_info=torrent_info)
+        return True
+
+    def __prefilter(self, contexts: List[Context], profiles: List[dict]) -> List[Tuple[int, Context, List[dict], str]]:
+        """
+        批量预过滤：将站点数据转为列（匹配文本、大小、指纹），对整批数据逐列判断大小区间、
+        包含/排除正则与已处理索引，返回 (原始位置, 上下文, 命中的方案, 指纹) 列表
+        """
+        batch = [(index, context) for index, context in enumerate(contexts) if context.torrent_info]
+        if not batch:
+            return []
+        texts = [self.__get_filter_content(c.torrent_info) for _, c in batch]
+        sizes = [float(c.torrent_info.size or 0) for _, c in batch]
+        fingerprints = [self.__get_seen_fingerprint(c.torrent_info) for _, c in batch]
+
+        seen_index = self._seen_index
+        unseen = [fp not in seen_index for fp in fingerprints]
+        masks = []
+        for profile in profiles:
+            mask = list(unseen)
+            bounds = profile.get("size_bounds")
+            if bounds:
+                if len(bounds) == 1:
+                    mask = [m and (not sz or sz >= bounds[0]) for m, sz in zip(mask, sizes)]
+                else:
+                    mask = [m and (not sz or bounds[0] <= sz <= bounds[1]) for m, sz in zip(mask, sizes)]
+            include_re = profile.get("include_re")
+            if include_re:
+                mask = [m and bool(include_re.search(text)) for m, text in zip(mask, texts)]
+            exclude_re = profile.get("exclude_re")
+            if exclude_re:
+                mask = [m and not exclude_re.search(text) for m, text in zip(mask, texts)]
+            masks.append(mask)
+
+        survivors = []
+        for row, (index, context) in enumerate(batch):
+            matched = [profile for profile, mask in zip(profiles, masks) if mask[row]]
+            if matched:
+                survivors.append((index, context, matched, fingerprints[row]))
+        self.__log_detail(f"批量预过滤：共 {len(batch)} 条，已处理 {unseen.count(False)} 条，进入逐条处理 {len(survivors)} 条")
+        return survivors
+
+    @staticmethod
+    def __get_filter_content(torrent_info: TorrentInfo) -> str:
+        """
+        包含/排除规则匹配的文本，与 TorrentHelper.filter_torrent 一致：标题、描述、标签与促销信息
+        """
+        return (f"{torrent_info.title} "
+                f"{torrent_info.description} "
+                f"{' '.join(torrent_info.labels or [])} "
+                f"{torrent_info.volume_factor} ")
+
+    @staticmethod
+    def __get_seen_fingerprint(torrent_info: TorrentInfo) -> str:
+        """
+        已处理索引使用的种子指纹：站点 + 下载链接（或标题）+ 大小
+        """
+        raw = f"{torrent_info.site}|{torrent_info.enclosure or torrent_info.title}|{torrent_info.size}"
+        return hashlib.md5(raw.encode("utf-8")).hexdigest()
 
-        # 2) 元信息识别，尽量提取季号；未识别到媒体名则放弃
+    def __load_seen_index(self, profiles: List[dict]):
+        """
+        校验已处理索引：方案配置变化后此前被拒绝的种子可能会被接受，需整体失效；同时淘汰过期项
+        """
+        signature_source = json.dumps(
+            [{k: v for k, v in p.items() if not k.endswith("_re")} for p in profiles],
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        signature = hashlib.md5(signature_source.encode("utf-8")).hexdigest()
+        if self._seen_index is None:
+            seen_data = self.get_data('seen_index') or {}
+            self._seen_index = seen_data.get("items") or {}
+            self._seen_signature = seen_data.get("signature")
+        if signature != self._seen_signature:
+            if self._seen_index:
+                logger.info("过滤方案已变化，已处理种子索引失效")
+            self._seen_index = {}
+            self._seen_signature = signature
+        expire_before = time.time() - self._seen_ttl
+        self._seen_index = {fp: ts for fp, ts in self._seen_index.items() if ts >= expire_before}
+
+    def __save_seen_index(self):
+        """
+        保存已处理索引，超过数量上限时保留最近处理的部分
+        """
+        if len(self._seen_index) > self._seen_limit:
+            latest = sorted(self._seen_index.items(), key=lambda x: x[1], reverse=True)[:self._seen_limit]
+            self._seen_index = dict(latest)
+        # 尚未提交的下载批次不落盘：运行中断时这些种子下次仍会被处理
+        in_flight = {self.__get_seen_fingerprint(entry.get("torrent_info")) for entry in self._download_batch}
+        items = {fp: ts for fp, ts in self._seen_index.items() if fp not in in_flight} if in_flight else self._seen_index
+        self.save_data('seen_index', {"signature": self._seen_signature, "items": items})
+
+    def __recognize(self, torrent_info: TorrentInfo) -> Tuple[Optional[MetaInfo], Optional[MediaInfo]]:
+        """
+        识别种子的元信息与媒体信息
+        """
         meta = MetaInfo(title=torrent_info.title, subtitle=torrent_info.description)
         season = self._get_season_from_title(torrent_info.title)
         if season:
@@ -827,39 +2308,54 @@ class SiteSubscriber(_PluginBase):
         if total_eps and getattr(meta, "begin_season", None) is None:
             meta.begin_season = 1
         if not meta.name:
-            logger.warning(f"'{torrent_info.title}' 未识别到有效媒体名称，无法应用优先级规则组")
-            return
+            self.__log_decision("名称未识别", f"'{torrent_info.title}' 未识别到有效媒体名称，无法应用优先级规则组", level="warning")
+            return None, None
         mediainfo: MediaInfo = self.searchchain.recognize_media(meta=meta)
         if not mediainfo:
-            logger.warning(f"未识别到媒体信息: '{torrent_info.title}'，无法应用优先级规则组")
-            return
+            self.__log_decision("媒体未识别", f"未识别到媒体信息: '{torrent_info.title}'，无法应用优先级规则组", level="warning")
+            return meta, None
         # 打印从 mediainfo 推断的总集数，来源明确
         try:
             season_no = getattr(meta, 'begin_season', None)
             mi_total = self._get_total_episodes_from_mediainfo(mediainfo, season_no)
-            logger.info(f"mediainfo - 媒体数据总集数: {mi_total or '-'}")
+            self.__log_detail(f"mediainfo - 媒体数据总集数: {mi_total or '-'}")
         except Exception:
             pass
+        return meta, mediainfo
+
+    def __process_profile(self, profile: dict, site_id: str, meta: MetaInfo, mediainfo: MediaInfo,
+                          torrent_info: TorrentInfo):
+        """
+        按单个方案执行规则组过滤、去重、尺寸与存量检查及最终动作
+        """
+        action = profile.get("action")
+        total_eps = self._get_total_episodes_from_title(f"{torrent_info.title} {torrent_info.description or ''}")
 
         # 3) 规则组过滤（用户配置的更细粒度优先规则）
-        if self._filter_groups:
+        if profile.get("filter_groups"):
             filtered_torrents = self.searchchain.filter_torrents(
-                rule_groups=self._filter_groups,
+                rule_groups=profile.get("filter_groups"),
                 torrent_list=[torrent_info],
                 mediainfo=mediainfo
             )
             if not filtered_torrents:
-                logger.info(f"'{torrent_info.title}' 不匹配优先级规则组，已跳过")
+                self.__log_decision("规则组不符", f"'{torrent_info.title}' 不匹配方案 {self._get_profile_label(profile)} 的优先级规则组，已跳过")
                 return
             torrent_info = filtered_torrents[0]
 
-        # 4) 构造历史唯一键与标准日志标题，用于去重与用户可读日志
+        # 4) 构造历史唯一键与标准日志标题，用于去重与用户可读日志；非默认方案的键带上方案名
         history_key = self._get_history_key(mediainfo, meta)
+        if history_key and profile.get("name"):
+            history_key = f"{history_key}@{profile.get('name')}"
         log_title = self._get_log_title(mediainfo.to_dict(), meta)
 
-        if history_key and self._history.get(history_key):
+        # 已下载的记录不视为已处理：键只到季，同一季后续的新集、合集或更好的版本仍需处理，由媒体库与订阅检查去重；
+        # 本轮批次中“下载中”的记录仍会拦截，避免同一媒体被其它站点重复加入
+        if history_key and self._history.get(history_key) \
+                and self._history[history_key].get("status") not in ("download_failed", "downloaded"):
             existing = self._history[history_key]
-            status_map = {"pending": "待确认", "confirmed": "已确认", "ignored": "已忽略"}
+            status_map = {"pending": "待确认", "processing": "处理中", "confirmed": "已确认", "ignored": "已忽略",
+                          "downloading": "下载中", "downloaded": "已下载", "resolved": "已满足"}
             status = existing.get("status")
             status_cn = status_map.get(status, "未知")
             if status == "pending":
@@ -886,11 +2382,15 @@ class SiteSubscriber(_PluginBase):
                         existing["latest_episode"] = latest_ep
                     # 更新最近一次统计更新时间
                     existing["time"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    self._history[history_key] = existing
-                    self.save_data('history', self._history)
-                    logger.info(f"'{log_title}' 已存在且为 待确认，已更新统计信息 (总集数={display_total or '-'}, 最新集数={latest_ep or '-'})")
+                    existing["version"] = self.__next_history_version()
+                    with self._history_lock:
+                        self._history[history_key] = existing
+                    self.__save_history()
+                    self.__log_decision("更新待办", f"'{log_title}' 已存在且为 待确认，已更新统计信息 (总集数={display_total or '-'}, 最新集数={latest_ep or '-'})")
+                else:
+                    self._site_stats["已在历史"] += 1
             else:
-                logger.info(f"'{log_title}' 已存在于历史记录中 (状态: {status_cn})，不更新")
+                self.__log_decision("已在历史", f"'{log_title}' 已存在于历史记录中 (状态: {status_cn})，不更新")
             return
 
         # 5) 计算用于存在性判断的集清单（不写入 meta，避免只读属性异常）
@@ -902,33 +2402,43 @@ class SiteSubscriber(_PluginBase):
             if mi_total:
                 computed_episode_list = list(range(1, mi_total + 1))
 
-        # 6) 尺寸过滤：配置为 GB，转为字节与种子 size 对比
-        if self._size_range and torrent_info.size:
-            sizes = [float(_size) * 1024 ** 3 for _size in self._size_range.split("-")]
-            if (len(sizes) == 1 and float(torrent_info.size) < sizes[0]) or \
-               (len(sizes) > 1 and not sizes[0] <= float(torrent_info.size) <= sizes[1]):
-                logger.info(f"'{torrent_info.title}' - 种子大小不符合条件，已跳过处理")
-                return
-
+        # 6) 尺寸过滤已在批量预过滤阶段完成
         # 7) 存量检查：媒体库存在或订阅已存在则跳过
         exists_full, complete_flag = self.media_exists_check(
             mediainfo=mediainfo, meta=meta, episode_list=computed_episode_list
         )
         if exists_full:
             suffix = "（无缺集）" if mediainfo.type == MediaType.TV and complete_flag else ""
-            logger.info(f"'{log_title}' 在媒体库中已存在{suffix}，已跳过处理")
+            self.__log_decision("媒体库已存在", f"'{log_title}' 在媒体库中已存在{suffix}，已跳过处理")
             return
 
         if self.subscribechain.exists(mediainfo=mediainfo, meta=meta):
-            logger.info(f"'{log_title}' 已在订阅中，已跳过处理")
+            self.__log_decision("已在订阅", f"'{log_title}' 已在订阅中，已跳过处理")
             return
 
         # 8) 最终动作：自动订阅 / 直接下载 / 加入待办
-        if self._action == "auto_subscribe":
-            logger.info(f"'{log_title}' 不在订阅中，开始自动订阅")
-            self.add_subscribe(meta=meta, mediainfo=mediainfo, site_id=site_id)
-        elif self._action == "download":
-            self.download_torrent(meta=meta, mediainfo=mediainfo, torrent_info=torrent_info)
+        if action == "auto_subscribe":
+            self.__log_decision("自动订阅", f"'{log_title}' 不在订阅中，开始自动订阅")
+            self.add_subscribe(meta=meta, mediainfo=mediainfo, site_id=site_id, profile=profile)
+        elif action == "download":
+            # 加入本轮下载批次，先写入“下载中”记录，避免同一媒体被其它站点重复加入
+            self.__log_decision("加入下载", f"'{log_title}' 已加入下载批次")
+            if history_key:
+                with self._history_lock:
+                    self._history[history_key] = {
+                        "title": torrent_info.title,
+                        "type": mediainfo.type.value,
+                        "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "status": "downloading",
+                        "action": action,
+                        "profile": profile.get("name"),
+                        "site_id": site_id,
+                        "key": history_key
+                    }
+            self._download_batch.append({
+                "key": history_key, "site_id": site_id, "meta": meta, "mediainfo": mediainfo,
+                "torrent_info": torrent_info, "profile": profile
+            })
         else:
             # 手动订阅：存入待办（meta 精简为可序列化字段，避免 Tokens 等对象导致保存失败）
             safe_meta = {
@@ -945,23 +2455,27 @@ class SiteSubscriber(_PluginBase):
                 "type": mediainfo.type.value,
                 "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "status": "pending",
-                "action": self._action,
+                "action": action,
+                "profile": profile.get("name"),
                 "site_id": site_id,
                 "meta": safe_meta,
                 "mediainfo": mediainfo.to_dict(),
                 "torrent_info": torrent_info.to_dict(),
                 "total_episodes": display_total if display_total else None,
                 "latest_episode": latest_ep if latest_ep else None,
-                "key": history_key
+                "key": history_key,
+                "version": self.__next_history_version()
             }
             if history_key:
-                self._history[history_key] = history_item
-                self.save_data('history', self._history)
+                with self._history_lock:
+                    self._history[history_key] = history_item
+                self.__save_history()
                 # 新增时也打印一次统计信息
                 stats_msg = ""
                 if display_total or latest_ep:
                     stats_msg = f" (总集数={display_total or '-'}, 最新集数={latest_ep or '-'})"
-                logger.info(f"'{log_title}' 已添加到待确认列表{stats_msg}")
+                self.__log_decision("加入待办", f"'{log_title}' 已添加到待确认列表{stats_msg}")
+                self.__prefetch_item_images(history_key)
                 if self._notify:
                     text = f"{log_title} 已添加到待确认列表，请及时处理。"
                     if self._independent_notify:
@@ -979,6 +2493,109 @@ class SiteSubscriber(_PluginBase):
                             overview=mediainfo.overview
                         )
 
+    def refresh_pending(self):
+        """
+        待办复查：按批检查待办项是否已在媒体库或订阅中，已满足的标记为 resolved。
+        订阅列表每轮只查询一次；待办项按 (tmdb_id, 类型) 分组，每组只构建一次 MediaInfo、查询一次媒体库，
+        同一媒体的多个季/方案共用结果。MoviePilot 没有批量查询媒体库的接口，每个媒体一次查询已是下限
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            logger.info("待办复查正在运行中，本次触发已合并跳过")
+            return
+        try:
+            active_keys = self.__get_active_job_keys()
+            pending_keys = [key for key, item in list(self._history.items())
+                            if item.get("status") == "pending" and key not in active_keys]
+            if not pending_keys:
+                return
+            logger.info(f"开始复查待办项：共 {len(pending_keys)} 项")
+
+            # 订阅：一次性读取全部订阅，按 (tmdbid, 季) 建立索引
+            subscribed = set()
+            for subscribe in SubscribeOper().list() or []:
+                if subscribe.tmdbid:
+                    subscribed.add((str(subscribe.tmdbid), subscribe.season or None))
+
+            # 按媒体分组：电影与剧集的 tmdb_id 可能相同，分组键包含类型
+            groups: Dict[Tuple[str, Optional[str]], List[str]] = {}
+            for key in pending_keys:
+                tmdb_id = ((self._history.get(key) or {}).get("mediainfo") or {}).get("tmdb_id")
+                if tmdb_id:
+                    groups.setdefault((str(tmdb_id), self._history[key].get("type")), []).append(key)
+
+            lookups = 0
+            resolved = 0
+            batch_count = 0
+            batch_resolved = 0
+            for (tmdb_id, mtype), keys in groups.items():
+                is_tv = mtype == MediaType.TV.value
+                mediainfo, exist_info = None, None
+                for key in keys:
+                    item = self._history.get(key)
+                    if not item or item.get("status") != "pending":
+                        continue
+                    batch_count += 1
+                    season = (item.get("meta") or {}).get("season")
+                    if (tmdb_id, season if is_tv else None) in subscribed:
+                        reason = "已在订阅中"
+                    else:
+                        # 组内首个需要查询媒体库的待办项触发查询，其余共用结果
+                        if mediainfo is None:
+                            mediainfo = MediaInfo()
+                            mediainfo.from_dict(item.get("mediainfo") or {})
+                            exist_info = self.searchchain.media_exists(mediainfo=mediainfo)
+                            lookups += 1
+                        reason = self.__get_library_satisfied_reason(item=item, mediainfo=mediainfo,
+                                                                     exist_info=exist_info)
+                    if not reason:
+                        continue
+                    with self._history_lock:
+                        item["status"] = "resolved"
+                        item["message"] = reason
+                    self.__remove_item_images(key)
+                    batch_resolved += 1
+                    self.__log_detail(f"'{self._get_log_title(item.get('mediainfo', {}), item.get('meta', {}))}' "
+                                      f"{reason}，已自动结束待办")
+                # 每批保存一次；同一媒体的待办项不跨批拆分
+                if batch_count >= self._pending_refresh_batch:
+                    if batch_resolved:
+                        self.__save_history()
+                        resolved += batch_resolved
+                    batch_count, batch_resolved = 0, 0
+            if batch_resolved:
+                self.__save_history()
+                resolved += batch_resolved
+            logger.info(f"待办复查完成：共 {len(pending_keys)} 项，自动结束 {resolved} 项，"
+                        f"媒体 {len(groups)} 个，查询媒体库 {lookups} 次")
+        except Exception as e:
+            logger.error(f"待办复查出错：{str(e)} - {traceback.format_exc()}")
+        finally:
+            self._refresh_lock.release()
+
+    def __get_library_satisfied_reason(self, item: dict, mediainfo: MediaInfo,
+                                       exist_info: Optional[ExistMediaInfo]) -> Optional[str]:
+        """
+        判断待办项是否已由媒体库满足，返回原因：电影已入库，或剧集该季集数齐全。
+        待办项未记录总集数时取媒体信息中该季的集数；仍无法确定时不自动结束
+        """
+        if not exist_info:
+            return None
+        if item.get("type") != MediaType.TV.value:
+            return "媒体库中已存在"
+        season = (item.get("meta") or {}).get("season")
+        season_no = season if season is not None else 1
+        exist_episodes = (getattr(exist_info, "seasons", None) or {}).get(season_no)
+        if not exist_episodes:
+            return None
+        total_eps = item.get("total_episodes") or self._get_total_episodes_from_mediainfo(mediainfo, season_no)
+        if not total_eps:
+            self.__log_detail(f"'{self._get_log_title(item.get('mediainfo', {}), item.get('meta', {}))}' "
+                              f"总集数未知，无法判断第 {season_no} 季是否齐全，保留待办", level="debug")
+            return None
+        if set(range(1, int(total_eps) + 1)).issubset(set(exist_episodes)):
+            return "媒体库中该季已齐全"
+        return None
+
     def media_exists_check(self, mediainfo: MediaInfo, meta: MetaInfo, episode_list: Optional[List[int]] = None) -> Tuple[bool, bool]:
         # 查询媒体是否已存在：电影看整体是否存在，剧集按季与集做“子集”判定
         exist_info: Optional[ExistMediaInfo] = self.searchchain.media_exists(mediainfo=mediainfo)
@@ -995,32 +2612,112 @@ class SiteSubscriber(_PluginBase):
             return False, False
         return bool(exist_info), bool(exist_info)
 
-    def download_torrent(self, meta: MetaInfo, mediainfo: MediaInfo, torrent_info: TorrentInfo):
-        self.downloadchain.download_single(
+    def download_torrent(self, meta: MetaInfo, mediainfo: MediaInfo, torrent_info: TorrentInfo,
+                         profile: Optional[dict] = None):
+        profile = profile or self.__get_profile()
+        return self.downloadchain.download_single(
             context=Context(meta_info=meta, media_info=mediainfo, torrent_info=torrent_info),
-            save_path=self._save_path,
-            downloader=self._downloader,
+            save_path=profile.get("save_path"),
+            downloader=profile.get("downloader"),
             username="站点资源订阅"
         )
 
-    def add_subscribe(self, meta: MetaInfo, mediainfo: MediaInfo, site_id: str):
-        quality = self._quality if self._quality and self._quality != '全部' else ""
-        resolution = self._resolution if self._resolution and self._resolution != '全部' else ""
-        effect = self._effect if self._effect and self._effect != '全部' else ""
+    def add_subscribe(self, meta: MetaInfo, mediainfo: MediaInfo, site_id: str, profile: Optional[dict] = None):
+        profile = profile or self.__get_profile()
+        quality = profile.get("quality") if profile.get("quality") and profile.get("quality") != '全部' else ""
+        resolution = profile.get("resolution") if profile.get("resolution") and profile.get("resolution") != '全部' else ""
+        effect = profile.get("effect") if profile.get("effect") and profile.get("effect") != '全部' else ""
         self.subscribechain.add(
             title=mediainfo.title, year=mediainfo.year, mtype=mediainfo.type,
             tmdbid=mediainfo.tmdb_id, season=meta.begin_season, exist_ok=True,
-            username="站点资源订阅", downloader=self._downloader, save_path=self._save_path,
+            username="站点资源订阅", downloader=profile.get("downloader"), save_path=profile.get("save_path"),
             quality=quality, resolution=resolution, effect=effect,
-            filter_groups=self._filter_groups, include=self._include, exclude=self._exclude,
+            filter_groups=profile.get("filter_groups"), include=profile.get("include"), exclude=profile.get("exclude"),
             sites=[site_id]
         )
 
+    def __get_profiles(self) -> List[dict]:
+        """
+        获取全部方案：基础配置为默认方案（name 为空），其后为多方案配置中的各方案
+        """
+        base = {
+            "name": None, "action": self._action, "include": self._include, "exclude": self._exclude,
+            "quality": self._quality, "resolution": self._resolution, "effect": self._effect,
+            "filter_groups": self._filter_groups, "size_range": self._size_range,
+            "downloader": self._downloader, "save_path": self._save_path,
+        }
+        profiles = [base]
+        config_value = self._profiles
+        if isinstance(config_value, str):
+            try:
+                config_value = json.loads(config_value) if config_value.strip() else []
+            except Exception as err:
+                logger.error(f"多方案配置解析失败：{err}")
+                config_value = []
+        names = set()
+        for conf in config_value or []:
+            if not isinstance(conf, dict) or not conf.get("name"):
+                logger.warning(f"多方案配置缺少 name，已跳过：{conf}")
+                continue
+            if conf.get("name") in names:
+                logger.warning(f"多方案配置 name 重复，已跳过：{conf.get('name')}")
+                continue
+            names.add(conf.get("name"))
+            profile = dict(base)
+            profile.update({key: value for key, value in conf.items() if key in base})
+            if profile.get("size_range") and not self.__is_number_or_range(str(profile.get("size_range"))):
+                logger.warning(f"方案 {profile.get('name')} 种子大小设置错误，已忽略：{profile.get('size_range')}")
+                profile["size_range"] = None
+            profiles.append(profile)
+        for profile in profiles:
+            # 包含/排除与大小在批量预过滤阶段处理，逐条过滤仅保留质量、分辨率、特效（空或“全部”不参与）
+            profile["filter_params"] = {
+                key: profile.get(key) for key in ["quality", "resolution", "effect"]
+                if profile.get(key) and profile.get(key) != '全部'
+            }
+            for key in ["include", "exclude"]:
+                try:
+                    profile[f"{key}_re"] = re.compile(profile.get(key), re.I) if profile.get(key) else None
+                except re.error as err:
+                    logger.error(f"方案 {self._get_profile_label(profile)} {key} 正则表达式错误，已忽略：{err}")
+                    profile[f"{key}_re"] = None
+            size_range = profile.get("size_range")
+            profile["size_bounds"] = [float(_size) * 1024 ** 3 for _size in str(size_range).split("-")] \
+                if size_range else None
+        return profiles
+
+    def __get_profile(self, name: Optional[str] = None) -> Optional[dict]:
+        """
+        按名称获取方案；未指定名称时返回默认方案，指定的名称不存在时返回 None
+        """
+        profiles = self.__get_profiles()
+        if not name:
+            return profiles[0]
+        for profile in profiles:
+            if profile.get("name") == name:
+                return profile
+        return None
+
+    @staticmethod
+    def _get_profile_label(profile: dict) -> str:
+        return profile.get("name") or "默认"
+
     def __log_and_notify_error(self, message):
         logger.error(message)
         self.systemmessage.put(message, title="站点资源订阅")
 
     def __validate_and_fix_config(self, config: dict = None) -> bool:
+        run_budget = config.get("run_budget")
+        if run_budget and not str(run_budget).isdigit():
+            self.__log_and_notify_error(f"站点资源订阅出错，单次运行时长上限设置错误：{run_budget}")
+            config["run_budget"] = 0
+        for key, default in (("breaker_threshold", 3), ("breaker_cooldown", 60), ("confirm_workers", 2),
+                             ("cache_max_age", 60), ("download_concurrency", 3), ("site_concurrency", 2),
+                             ("profiler_keep", 5), ("pending_refresh_interval", 6)):
+            value = config.get(key)
+            if value and not str(value).isdigit():
+                self.__log_and_notify_error(f"站点资源订阅出错，数值设置错误：{key}={value}")
+                config[key] = default
         size_range = config.get("size_range")
         if size_range and not self.__is_number_or_range(str(size_range)):
             self.__log_and_notify_error(f"站点资源订阅出错，种子大小设置错误：{size_range}")
@@ -0,0 +1,87 @@
+"""
+ShortPlayMonitor2 页面解码耗时基准：对比原先对整页 chardet.detect 与 __decode_page
+
+用法（仓库根目录，需要安装 chardet）：
+    python tests/bench_decode.py [--rows 300] [--repeat 5]
+
+生成与 NexusPHP 种子列表页结构、大小相近的合成页面（GBK 与 UTF-8 两种编码），按以下响应头/页面声明组合测量：
+- header：响应头声明了正确编码
+- meta：响应头未声明，页面 <meta> 声明了编码
+- none：都未声明
+- latin1：响应头错误声明为 iso-8859-1，页面 <meta> 声明了正确编码
+同时检查解码结果是否与原文一致
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import chardet
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _page(rows: int, charset: str, with_meta: bool) -> str:
+    meta = f'<meta http-equiv="Content-Type" content="text/html; charset={charset}">' if with_meta else ""
+    head = (f"<!DOCTYPE html><html><head>{meta}<title>种子列表 - 站点</title>"
+            "<link rel='stylesheet' href='styles/sprites.css'><script src='js/common.js'></script>"
+            "<style>" + ".torrentname td{padding:2px}" * 200 + "</style></head><body>")
+    body = []
+    for i in range(rows):
+        body.append(
+            f"<tr><td class='rowfollow'><img class='c_tvseries' alt='短剧'></td>"
+            f"<td class='embedded'><a href='details.php?id={100000 + i}&hit=1' title='逆袭人生第{i}部 全80集'>"
+            f"<b>Ni.Xi.Ren.Sheng.S01.2024.1080p.WEB-DL.H264.AAC-{i}</b></a><br/>逆袭人生 第{i}部 | 全80集 | 类型：短剧 爱情 都市</td>"
+            f"<td class='rowfollow'>2024-05-{i % 28 + 1:02d} 12:00:00</td><td class='rowfollow'>{i % 9 + 1}.{i % 10}GB</td>"
+            f"<td class='rowfollow'>{i % 50}</td><td class='rowfollow'>{i % 7}</td><td class='rowfollow'>{i * 3}</td>"
+            f"<td class='rowfollow'><a href='userdetails.php?id={i}'>用户{i}</a></td></tr>")
+    return head + "<table class='torrents'>" + "".join(body) + "</table></body></html>"
+
+
+def _load_plugin():
+    sys.path.insert(0, str(ROOT / "tests"))
+    import conftest
+
+    return conftest.load_plugin("shortplaymonitor2").ShortPlayMonitor2
+
+
+def _old_decode(ret) -> str:
+    encoding = chardet.detect(ret.content).get("encoding") or "utf-8"
+    return ret.content.decode(encoding, errors="replace")
+
+
+def _time(func, repeat: int) -> float:
+    # 预热一次，排除 chardet 首次加载模型的耗时
+    func()
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        results.append(time.perf_counter() - started)
+    return statistics.median(results) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    decode_page = _load_plugin()._ShortPlayMonitor2__decode_page
+    print(f"{'页面':<18}{'大小(KB)':>10}{'原先(ms)':>10}{'现在(ms)':>10}  原先正确  现在正确")
+    for charset, codec in (("gbk", "gb18030"), ("utf-8", "utf-8")):
+        for case in ("header", "meta", "none", "latin1"):
+            text = _page(args.rows, charset, with_meta=case in ("meta", "latin1"))
+            headers = {"header": {"Content-Type": f"text/html; charset={charset}"},
+                       "latin1": {"Content-Type": "text/html; charset=iso-8859-1"}}.get(case, {})
+            ret = SimpleNamespace(content=text.encode(codec), headers=headers)
+            old_ms = _time(lambda: _old_decode(ret), args.repeat)
+            new_ms = _time(lambda: decode_page(ret, "bench"), args.repeat)
+            print(f"{charset + '/' + case:<18}{len(ret.content) / 1024:>10.0f}{old_ms:>10.1f}{new_ms:>10.2f}"
+                  f"  {'是' if _old_decode(ret) == text else '否':<8}{'是' if decode_page(ret, 'bench') == text else '否'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+SiteSubscriber 启动耗时基准：对比延迟加载前后的模块导入与 init_plugin 耗时
+
+用法（仓库根目录）：
+    python tests/bench_startup.py [--before REV] [--history 2000] [--repeat 5]
+
+before 默认取延迟加载提交（user-037）之前的版本，after 为当前工作区。每次测量在独立子进程中进行，
+避免模块缓存影响导入耗时。
+
+测量范围与局限：
+- MoviePilot 主程序不在此环境中，app.* 使用 conftest 中的占位模块，测得的只是插件自身的开销；
+  各 Chain 的真实构造耗时无法测得，只统计构造次数，数据读取只统计次数，history 从 JSON 反序列化
+- “冷启动”行在子进程中首次导入 requests、pytz、PIL、APScheduler，导入耗时的差异几乎全部来自这些库；
+  在 MoviePilot 中它们早已由主程序加载，这部分收益接近 0
+- “预加载”行先导入这些第三方库再计时，更接近插件在 MoviePilot 中加载时的情况
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PLUGIN_FILE = "plugins.v2/sitesubscriber/__init__.py"
+
+
+def _history_blob(size: int) -> str:
+    history = {}
+    for i in range(size):
+        history[f"key-{i}"] = {
+            "title": f"Show {i} S01", "type": "电视剧", "year": "2024", "tmdbid": 100000 + i,
+            "season": 1, "status": "pending", "time": "2024-01-01 00:00:00",
+            "torrents": [{"title": f"Show.{i}.S01.2160p.WEB-DL", "site": "1", "size": 1 << 30}],
+        }
+    return json.dumps(history)
+
+
+PRELOAD_MODULES = ("requests", "pytz", "PIL.Image", "apscheduler.schedulers.background", "apscheduler.triggers.cron")
+
+
+def _child(source: str, history: int, preload: bool):
+    """
+    在子进程中导入插件并执行一次 init_plugin（插件未启用），输出 JSON 结果
+    """
+    sys.path.insert(0, str(ROOT / "tests"))
+    import conftest
+    import importlib
+    import importlib.util
+
+    conftest._install_stubs()
+    if preload:
+        for name in PRELOAD_MODULES:
+            importlib.import_module(name)
+    started = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("_bench_sitesubscriber", source)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    import_ms = (time.perf_counter() - started) * 1000
+
+    counts = {"chains": 0, "data_loads": 0}
+    for name in ("DownloadChain", "SearchChain", "SubscribeChain"):
+        def _counted(*args, **kwargs):
+            counts["chains"] += 1
+        setattr(module, name, _counted)
+
+    blob = _history_blob(history)
+
+    def _get_data(key=None):
+        counts["data_loads"] += 1
+        if key == "history":
+            return json.loads(blob)
+        return None
+
+    plugin = module.SiteSubscriber()
+    plugin.get_data = _get_data
+    plugin.save_data = lambda key, value: None
+    started = time.perf_counter()
+    plugin.init_plugin({"enabled": False, "address": [], "cron": ""})
+    init_ms = (time.perf_counter() - started) * 1000
+    print(json.dumps({"import_ms": import_ms, "init_ms": init_ms, **counts}))
+
+
+def _measure(source: str, history: int, repeat: int, preload: bool) -> dict:
+    results = []
+    for _ in range(repeat):
+        command = [sys.executable, __file__, "--child", source, "--history", str(history)]
+        if preload:
+            command.append("--preload")
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "import_ms": statistics.median(r["import_ms"] for r in results),
+        "init_ms": statistics.median(r["init_ms"] for r in results),
+        "chains": results[0]["chains"],
+        "data_loads": results[0]["data_loads"],
+    }
+
+
+def _default_before() -> str:
+    commit = subprocess.run(["git", "log", "--format=%H", "--reverse", "--grep=^\\[user-037\\]"],
+                            cwd=ROOT, check=True, capture_output=True, text=True).stdout.split()
+    return f"{commit[0]}^" if commit else "HEAD"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--before")
+    parser.add_argument("--history", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child")
+    parser.add_argument("--preload", action="store_true")
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child, args.history, args.preload)
+        return
+
+    before_rev = args.before or _default_before()
+    before_source = subprocess.run(["git", "show", f"{before_rev}:{PLUGIN_FILE}"],
+                                   cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    with tempfile.TemporaryDirectory() as tmp:
+        before_file = Path(tmp) / "before.py"
+        before_file.write_text(before_source, encoding="utf-8")
+        rows = []
+        for mode, preload in (("冷启动", False), ("预加载", True)):
+            rows.append((mode, "before", before_rev, _measure(str(before_file), args.history, args.repeat, preload)))
+            rows.append((mode, "after", "工作区", _measure(str(ROOT / PLUGIN_FILE), args.history, args.repeat, preload)))
+
+    print(f"history 条目数：{args.history}，每项取 {args.repeat} 次中位数；MoviePilot 主程序为占位模块，只测插件自身开销")
+    print(f"{'模式':<6}{'版本':<8}{'导入(ms)':>10}{'init(ms)':>10}{'Chain构造':>10}{'数据读取':>10}  来源")
+    for mode, label, rev, r in rows:
+        print(f"{mode:<6}{label:<8}{r['import_ms']:>10.1f}{r['init_ms']:>10.2f}{r['chains']:>10}{r['data_loads']:>10}  {rev}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+ShortPlayMonitor2 截图耗时基准：对比原先的输出定位截图命令、逐帧截图与快速截图
+
+用法（仓库根目录，需要 PATH 中有 ffmpeg）：
+    python tests/bench_thumb.py [--size 3840x2160] [--duration 30] [--bitrate 40M] [--repeat 3] [--before REV]
+
+先生成一段前 3 秒为黑屏的高码率测试视频，再分别测量：
+- original：原先截图的命令 `ffmpeg -y -i video -ss 00:00:10 -frames:v 1 out.jpg`（输出定位，从头解码到指定时间）
+- accurate：get_thumb_data（同样的输出定位，通过管道返回）
+- fast：get_thumb_fast（关键帧输入定位，一次调用输出多帧候选并在内存中择优）
+指定 --before 时额外测量该版本中的 get_thumb_fast
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PLUGIN_FILE = "plugins.v2/shortplaymonitor2/__init__.py"
+
+
+def _make_video(path: Path, size: str, duration: int, bitrate: str):
+    subprocess.run(["ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+                    "-f", "lavfi", "-i", f"testsrc2=size={size}:rate=24:duration={duration}",
+                    "-vf", "drawbox=color=black:t=fill:enable='lt(t,3)'",
+                    "-c:v", "libx264", "-preset", "ultrafast", "-b:v", bitrate, "-g", "48",
+                    "-pix_fmt", "yuv420p", str(path)], check=True)
+
+
+def _load_plugin(source: Path, name: str):
+    sys.path.insert(0, str(ROOT / "tests"))
+    import conftest
+    import importlib.util
+
+    conftest._install_stubs()
+    spec = importlib.util.spec_from_file_location(name, source)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _time(func, repeat: int):
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        ok = func()
+        results.append(time.perf_counter() - started)
+        if not ok:
+            return None
+    return statistics.median(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="3840x2160")
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--bitrate", default="40M")
+    parser.add_argument("--timeline", default="00:00:10")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--before")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "sample.mp4"
+        print(f"生成测试视频 {args.size} {args.duration}s {args.bitrate} ...")
+        _make_video(video, args.size, args.duration, args.bitrate)
+        module = _load_plugin(ROOT / PLUGIN_FILE, "_bench_shortplaymonitor2")
+        plugin = module.ShortPlayMonitor2
+
+        rows = [
+            ("original", _time(lambda: subprocess.run(
+                ["ffmpeg", "-y", "-loglevel", "error", "-i", str(video), "-ss", args.timeline,
+                 "-frames:v", "1", str(Path(tmp) / "thumb.jpg")]).returncode == 0, args.repeat)),
+            ("accurate", _time(lambda: plugin.get_thumb_data(str(video), args.timeline), args.repeat)),
+            ("fast", _time(lambda: plugin.get_thumb_fast(str(video), args.timeline), args.repeat)),
+        ]
+        if args.before:
+            source = subprocess.run(["git", "show", f"{args.before}:{PLUGIN_FILE}"], cwd=ROOT,
+                                    check=True, capture_output=True, text=True).stdout
+            before_file = Path(tmp) / "before.py"
+            before_file.write_text(source, encoding="utf-8")
+            before = _load_plugin(before_file, "_bench_shortplaymonitor2_before").ShortPlayMonitor2
+            rows.append((f"fast@{args.before}",
+                         _time(lambda: before.get_thumb_fast(str(video), args.timeline), args.repeat)))
+
+    print(f"截图时间点 {args.timeline}，每项取 {args.repeat} 次中位数")
+    for label, elapsed in rows:
+        print(f"{label:<16}{'失败' if elapsed is None else f'{elapsed:.3f} 秒':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+插件测试公共设置：MoviePilot 主程序不可安装时，为 app.* 与 fastapi 注入占位模块，
+使插件文件可以被导入，测试只覆盖不依赖主程序行为的插件内部逻辑
+"""
+import importlib.util
+import logging
+import sys
+import types
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent / "plugins.v2"
+
+
+class _StubModule(types.ModuleType):
+    """
+    任意属性都返回一个占位类的模块
+    """
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name == "logger":
+            value = logging.getLogger("moviepilot")
+            setattr(self, name, value)
+            return value
+        if name == "retry":
+            # 重试装饰器：原样返回被装饰的函数
+            value = lambda *args, **kwargs: (lambda func: func)
+            setattr(self, name, value)
+            return value
+        value = type(name, (), {"__init__": lambda self, *args, **kwargs: None})
+        setattr(self, name, value)
+        return value
+
+
+class _StubFinder:
+    """
+    为缺失的 app.* / fastapi 包提供占位模块
+    """
+    prefixes = ("app", "fastapi")
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname.split(".")[0] not in self.prefixes:
+            return None
+        return importlib.util.spec_from_loader(fullname, self, is_package=True)
+
+    def create_module(self, spec):
+        module = _StubModule(spec.name)
+        module.__path__ = []
+        return module
+
+    def exec_module(self, module):
+        pass
+
+
+def _install_stubs():
+    if any(isinstance(finder, _StubFinder) for finder in sys.meta_path):
+        return
+    for name in _StubFinder.prefixes:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            # 追加在末尾：已安装的真实包优先
+            sys.meta_path.append(_StubFinder())
+            return
+
+
+def load_plugin(name: str):
+    """
+    按文件路径导入插件模块（plugins.v2 目录名不是合法包名）
+    """
+    _install_stubs()
+    module_name = f"_plugin_{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, PLUGIN_ROOT / name / "__init__.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,255 @@
+"""
+ShortPlayMonitor2 插件内部逻辑测试
+"""
+import queue
+
+from conftest import load_plugin
+
+
+def _new_plugin():
+    module = load_plugin("shortplaymonitor2")
+    return module.ShortPlayMonitor2()
+
+
+def test_tasks_are_keyed_by_target_show_directory():
+    plugin = _new_plugin()
+    plugin._dirconf = {"/src/a": "/dst", "/src/b": "/dst"}
+    plugin._renameconf = {"/src/a": "smart", "/src/b": "smart"}
+    plugin._task_queue = queue.Queue()
+
+    # 两个监控目录中的同一剧集整理到同一目标目录
+    plugin._ShortPlayMonitor2__submit_files("/src/a", ["/src/a/Show.2024.WEB/S01E01.mp4"])
+    plugin._ShortPlayMonitor2__submit_files("/src/b", ["/src/b/Show.HDTV/S01E02.mp4"])
+    keys = [plugin._task_queue.get_nowait()[0] for _ in range(2)]
+    assert keys == ["/dst/Show", "/dst/Show"]
+
+    # 重命名配置无效时按源目录串行
+    plugin._renameconf["/src/a"] = None
+    plugin._ShortPlayMonitor2__submit_files("/src/a", ["/src/a/Other/S01E01.mp4"])
+    assert plugin._task_queue.get_nowait()[0] == "/src/a/Other"
+
+
+def test_cover_sources_skip_invalid_entries(monkeypatch):
+    import json
+    from types import SimpleNamespace
+
+    module = load_plugin("shortplaymonitor2")
+    monkeypatch.setattr(module, "SiteOper", lambda: SimpleNamespace(get_by_domain=lambda domain: domain))
+    monkeypatch.setattr(module, "SitesHelper", lambda: SimpleNamespace(get_indexer=lambda domain: None))
+
+    plugin = _new_plugin()
+    plugin._cover_sources = json.dumps([
+        "not-a-dict",
+        {"domain": "b.com", "url": "https://b.com/?s={title}", "priority": "2"},
+        {"domain": "c.com", "url": "https://c.com/?s={title}", "priority": "high"},
+        {"domain": "a.com", "url": "https://a.com/?s={title}", "priority": 1},
+        {"domain": "d.com", "url": "https://d.com/?s={title}"},
+        {"domain": "e.com"},
+    ])
+    sources = plugin._ShortPlayMonitor2__get_cover_sources()
+    assert [(source["domain"], source["priority"]) for source in sources] == [("a.com", 1), ("b.com", 2),
+                                                                              ("d.com", 99)]
+
+
+def test_page_source_stops_retrying_when_cancelled(monkeypatch):
+    import threading
+
+    module = load_plugin("shortplaymonitor2")
+    calls = []
+    cancel_event = threading.Event()
+
+    class _RequestUtils:
+        def __init__(self, **kwargs):
+            pass
+
+        def get_res(self, url, **kwargs):
+            calls.append(url)
+            cancel_event.set()
+            return None
+
+    monkeypatch.setattr(module, "RequestUtils", _RequestUtils)
+    plugin = _new_plugin()
+    plugin._retry_backoff = 0
+    plugin._rate_interval = 0
+    site = type("Site", (), {"cookie": None, "name": "site"})()
+    assert plugin._ShortPlayMonitor2__get_page_source("https://a.com/", site, cancel_event=cancel_event) == ""
+    assert calls == ["https://a.com/"]
+
+
+def test_stop_service_interrupts_back_off(monkeypatch):
+    import threading
+    import time
+
+    module = load_plugin("shortplaymonitor2")
+
+    class _RequestUtils:
+        def __init__(self, **kwargs):
+            pass
+
+        def get_res(self, url, **kwargs):
+            return None
+
+    monkeypatch.setattr(module, "RequestUtils", _RequestUtils)
+    plugin = _new_plugin()
+    plugin._retry_backoff = 30
+    plugin._rate_interval = 0
+    cancel_event = threading.Event()
+    plugin._cover_cancels.add(cancel_event)
+    site = type("Site", (), {"cookie": None, "name": "site"})()
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(
+        plugin._ShortPlayMonitor2__get_page_source("https://a.com/", site, cancel_event=cancel_event)))
+    started = time.monotonic()
+    thread.start()
+    time.sleep(0.2)
+    plugin.stop_service()
+    thread.join(timeout=5)
+
+    assert result == [""]
+    assert time.monotonic() - started < 5
+    # 类属性字典原地清空
+    assert module.ShortPlayMonitor2._rate_next == {}
+    assert module.ShortPlayMonitor2._cover_cancels == set()
+
+
+def test_decode_page_ignores_single_byte_header_charset():
+    from types import SimpleNamespace
+
+    module = load_plugin("shortplaymonitor2")
+    decode_page = module.ShortPlayMonitor2._ShortPlayMonitor2__decode_page
+    text = '<html><head><meta charset="gbk"><title>种子列表</title></head><body>逆袭人生 全80集</body></html>'
+
+    # 响应头错误声明为 iso-8859-1 时以 <meta> 为准
+    ret = SimpleNamespace(content=text.encode("gbk"), headers={"Content-Type": "text/html; charset=ISO-8859-1"})
+    assert decode_page(ret, "https://a.com/") == text
+    # 响应头声明正确时直接使用
+    ret = SimpleNamespace(content=text.encode("gbk"), headers={"Content-Type": "text/html; charset=GB2312"})
+    assert decode_page(ret, "https://a.com/") == text
+    # 未声明编码的 UTF-8 页面
+    plain = text.replace('<meta charset="gbk">', "")
+    assert decode_page(SimpleNamespace(content=plain.encode("utf-8"), headers={}), "https://a.com/") == plain
+
+
+def test_debounce_releases_files_once_stable(tmp_path):
+    plugin = _new_plugin()
+    plugin._debounce = 5
+    submitted = []
+    plugin._ShortPlayMonitor2__submit_files = lambda source_dir, file_paths: submitted.append((source_dir, file_paths))
+    show_dir = tmp_path / "Show"
+    show_dir.mkdir()
+    first, second = show_dir / "S01E01.mp4", show_dir / "S01E02.mp4"
+    first.write_bytes(b"a")
+    second.write_bytes(b"b")
+
+    # 重命名事件移除原路径，同一路径的重复事件只保留一条
+    plugin._ShortPlayMonitor2__queue_file(str(first) + ".part", str(tmp_path))
+    plugin._ShortPlayMonitor2__queue_file(str(first), str(tmp_path), src_path=str(first) + ".part")
+    plugin._ShortPlayMonitor2__queue_file(str(first), str(tmp_path))
+    plugin._ShortPlayMonitor2__queue_file(str(second), str(tmp_path))
+    assert sorted(plugin._pending_files) == [str(first), str(second)]
+
+    # 未到等待时间不处理
+    plugin._ShortPlayMonitor2__release_stable_files()
+    assert submitted == []
+
+    # 仍在写入的文件重新计时
+    for item in plugin._pending_files.values():
+        item["since"] -= 10
+    second.write_bytes(b"bb")
+    plugin._ShortPlayMonitor2__release_stable_files()
+    assert submitted == [(str(tmp_path), [str(first)])]
+
+    # 稳定后按剧集目录整组处理，已删除的文件直接移除
+    plugin._pending_files[str(second)]["since"] -= 10
+    plugin._ShortPlayMonitor2__queue_file(str(show_dir / "gone.mp4"), str(tmp_path))
+    plugin._ShortPlayMonitor2__release_stable_files()
+    assert submitted[1:] == [(str(tmp_path), [str(second)])]
+    assert plugin._pending_files == {}
+
+
+def _worker_plugin(handled, gate=None, overlaps=None):
+    import threading
+
+    plugin = _new_plugin()
+    plugin._workers = 2
+    running = set()
+    lock = threading.Lock()
+
+    def _handle_batch(task):
+        show_key, _, file_paths = task
+        with lock:
+            if show_key in running and overlaps is not None:
+                overlaps.append(show_key)
+            running.add(show_key)
+        if gate:
+            gate.wait(5)
+        with lock:
+            running.discard(show_key)
+            handled.extend(file_paths)
+
+    plugin._ShortPlayMonitor2__handle_batch = _handle_batch
+    return plugin
+
+
+def _wait_until(condition):
+    import time
+
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_workers_keep_order_within_show():
+    handled, overlaps = [], []
+    plugin = _worker_plugin(handled, overlaps=overlaps)
+    plugin._ShortPlayMonitor2__start_workers()
+    tasks = [("A", "/src", ["A1"]), ("A", "/src", ["A2"]), ("B", "/src", ["B1"]), ("A", "/src", ["A3"]),
+             ("B", "/src", ["B2"])]
+    for task in tasks:
+        plugin._task_queue.put(task)
+    plugin._task_queue.join()
+    _wait_until(lambda: len(handled) == len(tasks))
+    plugin.stop_service()
+
+    # 同一剧集不会被两个线程同时处理，且按投递顺序处理
+    assert overlaps == []
+    assert [name for name in handled if name.startswith("A")] == ["A1", "A2", "A3"]
+    assert [name for name in handled if name.startswith("B")] == ["B1", "B2"]
+
+
+def test_stop_service_carries_pending_work_over_restart():
+    import threading
+
+    handled = []
+    gate = threading.Event()
+    plugin = _worker_plugin(handled, gate=gate)
+    plugin._ShortPlayMonitor2__start_workers()
+    task_queue = plugin._task_queue
+    # A1、B1 处理中，A2 排在 A1 之后，C1 仍在队列中
+    task_queue.put(("A", "/src", ["/src/A/1.mp4"]))
+    _wait_until(lambda: "A" in plugin._active_shows)
+    task_queue.put(("A", "/src", ["/src/A/2.mp4"]))
+    _wait_until(lambda: plugin._active_shows.get("A"))
+    task_queue.put(("B", "/src", ["/src/B/1.mp4"]))
+    _wait_until(lambda: "B" in plugin._active_shows)
+    task_queue.put(("C", "/src", ["/src/C/1.mp4"]))
+    plugin._pending_files = {"/src/D/1.mp4": {"source_dir": "/src", "sig": None, "since": 0}}
+
+    plugin.stop_service()
+    gate.set()
+    _wait_until(lambda: len(handled) == 2)
+    assert sorted(handled) == ["/src/A/1.mp4", "/src/B/1.mp4"]
+    assert [task[2] for task in plugin._carryover_tasks] == [["/src/A/2.mp4"], ["/src/C/1.mp4"]]
+    assert list(plugin._pending_files) == ["/src/D/1.mp4"]
+
+    # 重新启动后继续处理，未开启稳定等待时等待中的文件直接投递
+    plugin._workers = 1
+    plugin._ShortPlayMonitor2__start_workers()
+    plugin._ShortPlayMonitor2__resume_pending()
+    plugin._task_queue.join()
+    _wait_until(lambda: len(handled) == 5)
+    plugin.stop_service()
+    assert handled[2:] == ["/src/A/2.mp4", "/src/C/1.mp4", "/src/D/1.mp4"]
+    assert plugin._carryover_tasks == [] and plugin._pending_files == {}
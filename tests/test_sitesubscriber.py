@@ -0,0 +1,377 @@
+"""
+SiteSubscriber 插件内部逻辑测试
+"""
+from types import SimpleNamespace
+
+from conftest import load_plugin
+
+
+def _new_plugin(store: dict):
+    module = load_plugin("sitesubscriber")
+    plugin = module.SiteSubscriber()
+    plugin.get_data = lambda key=None: store.get(key)
+    plugin.save_data = lambda key, value: store.__setitem__(key, value)
+    return plugin
+
+
+def test_seen_index_load_and_save():
+    store = {}
+    profiles = [{"name": None, "action": "download", "include": "4K"}]
+    torrent = SimpleNamespace(site=1, enclosure="https://example.com/dl/1", title="A", size=1024)
+
+    plugin = _new_plugin(store)
+    plugin._SiteSubscriber__load_seen_index(profiles)
+    fingerprint = plugin._SiteSubscriber__get_seen_fingerprint(torrent)
+    plugin._seen_index[fingerprint] = 4102444800
+    plugin._SiteSubscriber__save_seen_index()
+    assert store["seen_index"]["items"] == {fingerprint: 4102444800}
+
+    # 新实例从存储中读回索引
+    reloaded = _new_plugin(store)
+    reloaded._SiteSubscriber__load_seen_index(profiles)
+    assert fingerprint in reloaded._seen_index
+
+    # 方案变化后索引整体失效
+    reloaded._SiteSubscriber__load_seen_index([{"name": None, "action": "download", "include": "1080p"}])
+    assert reloaded._seen_index == {}
+
+
+def _context(link: str, pubdate: str = None):
+    return SimpleNamespace(torrent_info=SimpleNamespace(enclosure=link, page_url=None, title=link, pubdate=pubdate))
+
+
+def test_newest_context_uses_pubdate_then_source_order():
+    module = load_plugin("sitesubscriber")
+    newest = module.SiteSubscriber._SiteSubscriber__get_newest_context
+    # 系统缓存：旧的在前，新的追加在末尾
+    cached = [_context("old", "2026-01-01 00:00:00"), _context("new", "2026-01-02 00:00:00")]
+    assert newest(cached, fallback_index=-1).torrent_info.enclosure == "new"
+    # 直接检索：新的在前
+    searched = [_context("new", "2026-01-02 00:00:00"), _context("old", "2026-01-01 00:00:00")]
+    assert newest(searched, fallback_index=0).torrent_info.enclosure == "new"
+    # 无发布时间时按来源顺序
+    assert newest([_context("a"), _context("b")], fallback_index=-1).torrent_info.enclosure == "b"
+
+
+def test_get_profile_unknown_name_returns_none():
+    plugin = _new_plugin({})
+    plugin._profiles = '[{"name": "4K", "save_path": "/media/4k"}]'
+    get_profile = plugin._SiteSubscriber__get_profile
+    assert get_profile()["name"] is None
+    assert get_profile("4K")["save_path"] == "/media/4k"
+    assert get_profile("已删除的方案") is None
+
+
+def test_in_flight_downloads_are_not_persisted():
+    store = {}
+    plugin = _new_plugin(store)
+    plugin._SiteSubscriber__load_seen_index([{"name": None}])
+    torrent = SimpleNamespace(site=1, enclosure="https://example.com/dl/2", title="B", size=2048)
+    fingerprint = plugin._SiteSubscriber__get_seen_fingerprint(torrent)
+    plugin._seen_index[fingerprint] = 4102444800
+    plugin._download_batch = [{"key": "1_S01", "torrent_info": torrent}]
+    plugin._history_data = {"1_S01": {"status": "downloading"}, "2": {"status": "pending"}}
+
+    plugin._SiteSubscriber__save_history()
+    plugin._SiteSubscriber__save_seen_index()
+    assert list(store["history"]) == ["2"]
+    assert store["seen_index"]["items"] == {}
+    # 内存中仍保留，用于本轮去重
+    assert fingerprint in plugin._seen_index
+
+
+def test_legacy_downloading_entries_reset_on_load():
+    plugin = _new_plugin({"history": {"1_S01": {"status": "downloading"}}})
+    plugin._history_data = None
+    assert plugin._history["1_S01"]["status"] == "download_failed"
+
+
+def _worker_task():
+    return sum(range(1000))
+
+
+def test_profile_saves_summary_with_scope(tmp_path):
+    plugin = _new_plugin({})
+    plugin.get_data_path = lambda: tmp_path
+    plugin._SiteSubscriber__check = _worker_task
+    plugin._SiteSubscriber__check_with_profiler()
+
+    summary = next((tmp_path / "profiler").glob("*.txt")).read_text(encoding="utf-8")
+    assert "统计范围：" in summary
+    assert "_worker_task" in summary
+
+
+def test_profile_skipped_when_another_profiler_is_active(tmp_path):
+    import cProfile
+    import sys
+
+    import pytest
+
+    if sys.version_info < (3, 12):
+        pytest.skip("Python 3.12 之前 cProfile 只记录调用线程，可同时启用多个")
+    plugin = _new_plugin({})
+    plugin.get_data_path = lambda: tmp_path
+    calls = []
+    plugin._SiteSubscriber__check = lambda: calls.append(True)
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        plugin._SiteSubscriber__check_with_profiler()
+    finally:
+        other.disable()
+    # 其它分析器占用时照常运行，但不保存结果
+    assert calls == [True]
+    assert not (tmp_path / "profiler").exists()
+
+
+def test_refresh_pending_groups_library_lookups(tmp_path, monkeypatch):
+    module = load_plugin("sitesubscriber")
+
+    class _MediaInfo:
+        def from_dict(self, data):
+            self.seasons = data.get("seasons") or {}
+
+        def to_dict(self):
+            return {"seasons": self.seasons}
+
+    monkeypatch.setattr(module, "MediaType", SimpleNamespace(TV=SimpleNamespace(value="电视剧")))
+    monkeypatch.setattr(module, "MediaInfo", _MediaInfo)
+    monkeypatch.setattr(module, "SubscribeOper", lambda: SimpleNamespace(list=lambda: []))
+
+    def _item(tmdb_id, mtype, season=None, total=None, seasons=None):
+        return {"status": "pending", "type": mtype, "total_episodes": total, "meta": {"season": season},
+                "mediainfo": {"tmdb_id": tmdb_id, "title": str(tmdb_id), "seasons": seasons or {}}}
+
+    store = {"history": {
+        # 同一剧集的两季只查询一次媒体库
+        "tv-s1": _item(1, "电视剧", season=1, total=2),
+        "tv-s2": _item(1, "电视剧", season=2, total=3),
+        # 未记录总集数：取媒体信息中该季集数
+        "tv-mi": _item(2, "电视剧", season=1, seasons={1: [1, 2]}),
+        # 总集数完全未知：保留待办
+        "tv-unknown": _item(3, "电视剧", season=1),
+        # 与剧集 tmdb_id 相同的电影单独查询
+        "movie": _item(1, "电影"),
+    }}
+    lookups = []
+
+    def _media_exists(mediainfo):
+        lookups.append(mediainfo)
+        return SimpleNamespace(seasons={1: [1, 2], 2: [1, 2]})
+
+    plugin = _new_plugin(store)
+    plugin.get_data_path = lambda: tmp_path
+    plugin._searchchain = SimpleNamespace(media_exists=_media_exists)
+    plugin.refresh_pending()
+
+    status = {key: item["status"] for key, item in store["history"].items()}
+    assert status == {"tv-s1": "resolved", "tv-s2": "pending", "tv-mi": "resolved",
+                      "tv-unknown": "pending", "movie": "resolved"}
+    assert len(lookups) == 4
+
+
+def _search_plugin(search):
+    plugin = _new_plugin({})
+    plugin._site_health = {}
+    plugin._site_searches = {}
+    plugin._search_executor = None
+    plugin._breaker_threshold = 2
+    plugin._breaker_cooldown = 60
+    plugin._searchchain = SimpleNamespace(search_by_title=search)
+    return plugin
+
+
+def test_breaker_opens_after_threshold_and_recovers_on_probe():
+    calls = []
+    results = {"value": None}
+
+    def _search(title, sites):
+        calls.append(sites[0])
+        return results["value"]
+
+    plugin = _search_plugin(_search)
+    search_site = plugin._SiteSubscriber__search_site
+    try:
+        assert search_site("1") is None
+        assert plugin._site_health["1"]["state"] == "closed"
+        assert search_site("1") is None
+        assert plugin._site_health["1"]["state"] == "open"
+
+        # 冷却期内不再请求站点
+        assert search_site("1") is None
+        assert len(calls) == 2
+
+        # 冷却结束后半开探测，成功即恢复
+        plugin._site_health["1"]["opened_at"] -= 61 * 60
+        results["value"] = ["context"]
+        assert search_site("1") == ["context"]
+        health = plugin._site_health["1"]
+        assert (health["state"], health["failures"], len(calls)) == ("closed", 0, 3)
+    finally:
+        plugin._search_executor.shutdown(wait=True)
+
+
+def test_queued_search_cancelled_on_timeout_is_not_a_failure():
+    import threading
+
+    release = threading.Event()
+    plugin = _search_plugin(lambda title, sites: release.wait(5) and ["context"])
+    plugin._search_workers = 1
+    plugin._get_site_timeout = lambda latencies: 0.2
+    search_site = plugin._SiteSubscriber__search_site
+    try:
+        # 站点 1 占满线程池后超时，计为失败；站点 2 的请求仍在排队，超时后取消，不计入失败
+        assert search_site("1") is None
+        assert plugin._site_health["1"]["failures"] == 1
+        assert search_site("2") is None
+        assert plugin._site_health["2"]["failures"] == 0
+        assert "2" not in plugin._site_searches
+    finally:
+        release.set()
+        plugin._search_executor.shutdown(wait=True)
+
+
+class _FromDict:
+    description = None
+
+    def from_dict(self, data):
+        self.__dict__.update(data)
+
+
+def _job_plugin(tmp_path, history: dict):
+    plugin = _new_plugin({})
+    plugin.get_data_path = lambda: tmp_path
+    plugin._history_data = history
+    plugin._jobs = {}
+    plugin._job_executor = SimpleNamespace(submit=lambda *args, **kwargs: None)
+    return plugin
+
+
+def _pending(title: str) -> dict:
+    return {"status": "pending", "title": title, "action": "download", "meta": {}, "mediainfo": {}}
+
+
+def test_submit_job_reuses_active_job_for_key(tmp_path, monkeypatch):
+    from enum import Enum
+
+    monkeypatch.setattr(load_plugin("sitesubscriber"), "MediaType", Enum("MediaType", {"TV": "电视剧", "MOVIE": "电影"}))
+    plugin = _job_plugin(tmp_path, {"a": _pending("A"), "b": _pending("B")})
+    submit = plugin._SiteSubscriber__submit_job
+    single = submit(job_type="confirm", key="b", func=None)
+    bulk = submit(job_type="confirm", key=None, func=None, keys=["a"])
+    assert submit(job_type="ignore", key="b", func=None) is single
+    # 单项任务复用已包含该项的批量任务
+    assert submit(job_type="ignore", key="a", func=None) is bulk
+    assert len(plugin._jobs) == 2
+
+
+def test_confirm_claims_item_before_work(tmp_path, monkeypatch):
+    import threading
+
+    module = load_plugin("sitesubscriber")
+    monkeypatch.setattr(module, "MediaInfo", _FromDict)
+    monkeypatch.setattr(module, "TorrentInfo", _FromDict)
+    store = {}
+    plugin = _job_plugin(tmp_path, {"a": _pending("A")})
+    plugin.save_data = lambda key, value: store.__setitem__(key, value)
+    started, release, downloads = threading.Event(), threading.Event(), []
+
+    def _download(**kwargs):
+        downloads.append(kwargs)
+        started.set()
+        release.wait(5)
+
+    plugin.download_torrent = _download
+    confirm = threading.Thread(target=plugin._SiteSubscriber__execute_confirm, args=("a",))
+    confirm.start()
+    try:
+        assert started.wait(5)
+        assert plugin._history["a"]["status"] == "processing"
+        # 处理中的项不会被再次确认或忽略；落盘时按待确认保存
+        assert plugin._SiteSubscriber__apply_confirm("a")[0] is False
+        assert plugin._SiteSubscriber__execute_ignore("a")[0] is False
+        plugin._SiteSubscriber__save_history()
+        assert store["history"]["a"]["status"] == "pending"
+    finally:
+        release.set()
+        confirm.join(5)
+    assert len(downloads) == 1
+    assert plugin._history["a"]["status"] == "confirmed"
+
+
+def test_failed_confirm_releases_claim(tmp_path, monkeypatch):
+    module = load_plugin("sitesubscriber")
+    monkeypatch.setattr(module, "MediaInfo", _FromDict)
+    monkeypatch.setattr(module, "TorrentInfo", _FromDict)
+    plugin = _job_plugin(tmp_path, {"a": _pending("A")})
+
+    def _download(**kwargs):
+        raise RuntimeError("下载器不可用")
+
+    plugin.download_torrent = _download
+    success, _ = plugin._SiteSubscriber__apply_confirm("a")
+    assert success is False
+    assert plugin._history["a"]["status"] == "pending"
+
+
+def test_bulk_job_skips_keys_already_in_active_jobs(tmp_path):
+    plugin = _job_plugin(tmp_path, {"a": _pending("A"), "b": _pending("B"), "c": _pending("C")})
+    submit = plugin._SiteSubscriber__submit_job
+    assert submit(job_type="confirm", key=None, func=None, keys=["a", "b"])["keys"] == ["a", "b"]
+    # 批量任务剔除已在处理中的项，全部已在处理中时不提交
+    assert submit(job_type="ignore", key=None, func=None, keys=["a", "b"]) is None
+    assert submit(job_type="ignore", key=None, func=None, keys=["b", "c"])["keys"] == ["c"]
+    assert len(plugin._jobs) == 2
+
+
+def test_image_tasks_save_history_once_per_batch(tmp_path):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    plugin = _job_plugin(tmp_path, {key: _pending(key) for key in ("a", "b", "c")})
+    saves = []
+    plugin.save_data = lambda key, value: saves.append(key)
+    go = threading.Event()
+    plugin._SiteSubscriber__cache_item_images = lambda key: go.wait(5) and key != "b"
+    prefetch = plugin._SiteSubscriber__prefetch_item_images
+
+    # 运行期间完成的任务不保存，由本轮结束时的保存一并落盘
+    plugin._image_executor = ThreadPoolExecutor(max_workers=2)
+    with plugin._check_lock:
+        go.set()
+        for key in ("a", "b", "c"):
+            prefetch(key)
+        plugin._image_executor.shutdown(wait=True)
+    assert saves == []
+    plugin._SiteSubscriber__save_history()
+    assert plugin._image_dirty is False
+
+    # 运行结束后仍在进行的一批任务，最后一个结束时只保存一次
+    saves.clear()
+    go.clear()
+    plugin._image_executor = ThreadPoolExecutor(max_workers=2)
+    for key in ("a", "b", "c"):
+        prefetch(key)
+    go.set()
+    plugin._image_executor.shutdown(wait=True)
+    assert saves == ["history"]
+    assert plugin._image_tasks == 0
+
+
+def test_prefilter_matches_labels_and_volume_factor():
+    import re
+
+    plugin = _new_plugin({})
+    plugin._seen_index = {}
+
+    def _torrent(link, labels, volume_factor):
+        return SimpleNamespace(torrent_info=SimpleNamespace(
+            site=1, enclosure=link, title="Show S01 1080p", description=None, size=0,
+            labels=labels, volume_factor=volume_factor))
+
+    contexts = [_torrent("1", [], "免费"), _torrent("2", ["中字"], "普通"), _torrent("3", [], "普通")]
+    # 与 TorrentHelper.filter_torrent 一致：促销信息与标签也参与包含/排除匹配
+    free = [{"name": None, "include_re": re.compile("免费|Free", re.I)}]
+    assert [row[0] for row in plugin._SiteSubscriber__prefilter(contexts, free)] == [0]
+    no_subs = [{"name": None, "exclude_re": re.compile("中字", re.I)}]
+    assert [row[0] for row in plugin._SiteSubscriber__prefilter(contexts, no_subs)] == [0, 2]